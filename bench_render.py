@@ -0,0 +1,162 @@
+"""
+Scroll and repaint frame-time benchmark for the task list.
+
+Loads N tasks into a real window on Qt's `offscreen` platform, then
+drives it the way a user does: scrolling `task_list` row by row, hovering
+task cards and ticking checkboxes. Every step is one frame, timed in two
+parts:
+
+    layout  the interaction itself plus the layout requests it posts
+            (widget geometry, scrolled index widgets, low-memory rows);
+            for checkbox toggles this includes saving the task file
+    paint   a synchronous repaint of the whole window
+
+Each scenario runs with and without the background image and with and
+without the card shadow effects, so rendering changes can be compared.
+
+Usage:
+    python3 bench_render.py [--tasks N] [--steps N] [--low-memory]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication
+
+import todolist
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKGROUND_IMAGE = os.path.join(REPO_DIR, "background.jpg")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def sample_tasks(count):
+    """Varied task entries, including some long enough to wrap"""
+    words = ["breakfast", "study", "lunch", "water the plants", "call mom",
+             "write the weekly report and send it to the whole team", "gym", "read"]
+    return [{"text": f"{words[i % len(words)]} #{i}", "completed": i % 4 == 0}
+            for i in range(count)]
+
+
+class FrameTimer:
+    """Collects per-frame layout and paint times for one scenario"""
+
+    def __init__(self, app, window):
+        self.app = app
+        self.window = window
+        self.frames = {}
+
+    def frame(self, kind, action):
+        """Run one interaction and time its layout and paint phases (ms)"""
+        start = time.perf_counter()
+        action()
+        self.app.sendPostedEvents(None, QEvent.Type.LayoutRequest.value)
+        laid_out = time.perf_counter()
+        self.window.repaint()
+        painted = time.perf_counter()
+        # Flush everything else (deferred deletes, timers) outside the timing
+        self.app.processEvents()
+        layout_ms, paint_ms = (laid_out - start) * 1000, (painted - laid_out) * 1000
+        self.frames.setdefault(kind, ([], []))
+        self.frames[kind][0].append(layout_ms)
+        self.frames[kind][1].append(paint_ms)
+
+
+def run_scenario(app, tasks, steps, background, shadows, low_memory):
+    """Load the tasks into a fresh window and time scroll, hover and toggle frames"""
+    workdir = tempfile.mkdtemp(prefix="bench_render_")
+    with open(os.path.join(workdir, "pixel_todo_tasks.json"), 'w', encoding='utf-8') as f:
+        json.dump(tasks, f)
+    if background and os.path.exists(BACKGROUND_IMAGE):
+        shutil.copy(BACKGROUND_IMAGE, os.path.join(workdir, "background.jpg"))
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    todolist.TaskWidget.shadow_enabled = shadows
+    os.environ["PIXEL_TODO_LOW_MEMORY"] = "1" if low_memory else "0"
+    try:
+        window = todolist.PixelTodoApp()
+        window.show()
+        app.processEvents()
+        timer = FrameTimer(app, window)
+        task_list = window.task_list
+        scrollbar = task_list.verticalScrollBar()
+
+        # Scroll down and back up one step per frame
+        maximum = scrollbar.maximum()
+        stride = max(1, maximum // max(1, steps // 2))
+        positions = list(range(0, maximum + 1, stride))
+        for value in positions + positions[::-1]:
+            timer.frame("scroll", lambda value=value: scrollbar.setValue(value))
+
+        # Hover and checkbox toggles on the rows currently on screen
+        visible = [task_list.itemWidget(task_list.item(row)) for row in range(task_list.count())]
+        visible = [widget for widget in visible if widget is not None and widget.isVisible()]
+        for i in range(steps):
+            widget = visible[i % len(visible)] if visible else None
+            if widget is None:
+                break
+            event = QEvent.Type.Enter if i % 2 == 0 else QEvent.Type.Leave
+            timer.frame("hover", lambda: QApplication.sendEvent(widget, QEvent(event)))
+        for i in range(min(steps, 2 * len(visible))):
+            widget = visible[i % len(visible)]
+            timer.frame("toggle", lambda: widget.checkbox.setChecked(not widget.checkbox.isChecked()))
+
+        window._allow_close = True
+        window.backup_after_save.stop()
+        window.hide()
+        window.deleteLater()
+        app.processEvents()
+        return timer.frames
+    finally:
+        todolist.TaskWidget.shadow_enabled = True
+        os.environ.pop("PIXEL_TODO_LOW_MEMORY", None)
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    """Run every scenario and print p50/p95/p99 frame times"""
+    parser = argparse.ArgumentParser(description="Benchmark task list scroll and repaint")
+    parser.add_argument("--tasks", type=int, default=300, help="tasks to load (default: 300)")
+    parser.add_argument("--steps", type=int, default=60, help="frames per interaction (default: 60)")
+    parser.add_argument("--low-memory", action="store_true", help="run in low-memory mode")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    tasks = sample_tasks(args.tasks)
+
+    print(f"🌙 Frame times for {args.tasks} tasks"
+          f"{' (low-memory mode)' if args.low_memory else ''}, in ms")
+    print(f"{'scenario':<28}{'frame':<8}{'phase':<8}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for background in (True, False):
+        for shadows in (True, False):
+            name = (f"{'background' if background else 'no background'}, "
+                    f"{'shadows' if shadows else 'no shadows'}")
+            frames = run_scenario(app, tasks, args.steps, background, shadows, args.low_memory)
+            for kind, (layout, paint) in frames.items():
+                for phase, samples in (("layout", layout), ("paint", paint)):
+                    print(f"{name:<28}{kind:<8}{phase:<8}"
+                          f"{percentile(samples, 50):8.2f}"
+                          f"{percentile(samples, 95):8.2f}"
+                          f"{percentile(samples, 99):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
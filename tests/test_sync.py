@@ -0,0 +1,88 @@
+"""
+Regression tests for todo_sync: devices joining late and bad log lines.
+
+Run: python3 -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from todo_records import TaskRecord  # noqa: E402
+from todo_sync import SyncLog  # noqa: E402
+
+
+def run_sync(share, device_dir):
+    """Run the sync CLI for one device and return its task list"""
+    subprocess.run([sys.executable, os.path.join(ROOT, "todo_sync.py"), str(share)],
+                   cwd=device_dir, check=True, capture_output=True)
+    with open(os.path.join(device_dir, "pixel_todo_tasks.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_tasks(device_dir, tasks):
+    with open(os.path.join(device_dir, "pixel_todo_tasks.json"), 'w', encoding='utf-8') as f:
+        json.dump(tasks, f)
+
+
+def completed(tasks, text):
+    return next(task["completed"] for task in tasks if task["text"] == text)
+
+
+@pytest.fixture
+def devices(tmp_path):
+    share, a, b = tmp_path / "share", tmp_path / "a", tmp_path / "b"
+    for path in (share, a, b):
+        path.mkdir()
+    return share, a, b
+
+
+def test_late_join_with_stale_copy_keeps_peer_edits(devices):
+    share, a, b = devices
+    shared = [{"text": f"task {i}", "completed": False, "created_at": i} for i in range(20)]
+    write_tasks(b, shared)
+    tasks = run_sync(share, b)
+    for task in tasks:
+        if task["text"] == "task 3":
+            task["completed"], task["completed_at"] = True, 100
+    write_tasks(b, tasks)
+    run_sync(share, b)
+
+    # A joins with more tasks than B ever logged, ahead of a stale copy of B's list
+    extra = [{"text": f"extra {i}", "completed": False, "created_at": 1000 + i}
+             for i in range(30)]
+    write_tasks(a, extra + shared)
+    tasks_a = run_sync(share, a)
+    tasks_b = run_sync(share, b)
+
+    assert completed(tasks_a, "task 3") and completed(tasks_b, "task 3")
+    assert sorted(task["text"] for task in tasks_a) == sorted(task["text"] for task in tasks_b)
+    assert len(tasks_a) == 50
+
+
+def test_malformed_log_lines_are_skipped(devices):
+    share, a, _ = devices
+    good = {"c": 3, "t": "abc", "f": {"text": "kept", "completed": False}}
+    lines = ['{"c": "7", "t": "x", "f": {"text": "bad clock"}}',
+             '{"c": 1, "t": "y", "f": [1]}',
+             '{"c": 2, "t": 5, "f": {"text": "bad id"}}',
+             '[1, 2]',
+             '{"c": 4, "t": "z", "f": {"text": "bad tags", "tags": 5}}',
+             json.dumps(good)]
+    (share / "peer.log").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    sync = SyncLog(str(share), str(a / "pixel_todo_sync.db"))
+    try:
+        changes = sync.pull()
+        assert [(task_id, record.text) for task_id, record in changes] == [("abc", "kept")]
+        # The bad lines were read past, so the next pull has nothing left
+        assert sync.pull() == []
+        assert isinstance(changes[0][1], TaskRecord)
+    finally:
+        sync.close()
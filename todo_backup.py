@@ -0,0 +1,256 @@
+"""
+Incremental, deduplicated snapshot backups for the Nighttime To-Do List.
+
+Each snapshot of `pixel_todo_tasks.json` is split into content-defined
+chunks stored once under their SHA-256 in `pixel_todo_backups/chunks`;
+a snapshot is just a small manifest listing its chunks. Chunk boundaries
+are picked from the content itself (a hash over the last few lines), so
+inserting or editing a task only changes the chunk around it and every other chunk is shared
+with earlier snapshots. Old snapshots are rotated out and chunks no
+snapshot references any more are removed.
+
+Usage:
+    python3 todo_backup.py snapshot
+    python3 todo_backup.py list
+    python3 todo_backup.py restore [SNAPSHOT_ID]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+
+# A chunk ends where the hash of the last four lines (about one task entry) has its
+# low bits zero, about every 64 lines; hashing a whole entry rather than a
+# single line keeps repeated lines like "  }," from cutting everywhere
+BOUNDARY_MASK = 0x3F
+WINDOW_LINES = 4
+MIN_CHUNK_LINES = 16
+MAX_CHUNK_LINES = 1024
+
+
+def split_chunks(data):
+    """Yield content-defined chunks of `data`, cut on line boundaries"""
+    start = pos = lines = 0
+    window = [0] * WINDOW_LINES
+    for index, line in enumerate(data.splitlines(keepends=True)):
+        pos += len(line)
+        lines += 1
+        window[index % WINDOW_LINES] = zlib.crc32(line)
+        boundary = window[0] ^ window[1] ^ window[2] ^ window[3]
+        if ((lines >= MIN_CHUNK_LINES and boundary & BOUNDARY_MASK == 0)
+                or lines >= MAX_CHUNK_LINES):
+            yield data[start:pos]
+            start, lines = pos, 0
+    if start < len(data):
+        yield data[start:]
+
+
+class SnapshotStore:
+    """Content-addressed chunk store plus rotated snapshot manifests"""
+
+    def __init__(self, backup_dir="pixel_todo_backups", keep=48):
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.chunk_dir = os.path.join(backup_dir, "chunks")
+        self.snapshot_dir = os.path.join(backup_dir, "snapshots")
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def _manifest_path(self, snapshot_id):
+        return os.path.join(self.snapshot_dir, snapshot_id + ".json")
+
+    def snapshots(self):
+        """Return snapshot ids, oldest first"""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.snapshot_dir)
+                      if name.endswith(".json"))
+
+    def manifest(self, snapshot_id):
+        """Load a snapshot's manifest"""
+        with open(self._manifest_path(snapshot_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def snapshot(self, tasks_file):
+        """Back up `tasks_file`; return the new snapshot id, or None if unchanged"""
+        with self._lock:
+            with open(tasks_file, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            existing = self.snapshots()
+            if existing and self.manifest(existing[-1]).get("sha256") == digest:
+                return None  # nothing changed since the last snapshot
+
+            chunks = []
+            for chunk in split_chunks(data):
+                chunk_digest = hashlib.sha256(chunk).hexdigest()
+                path = self._chunk_path(chunk_digest)
+                if not os.path.exists(path):
+                    # Only chunks never seen before cost any disk space
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    _write_atomic(path, zlib.compress(chunk))
+                chunks.append(chunk_digest)
+
+            snapshot_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            manifest = {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "size": len(data),
+                "sha256": digest,
+                "chunks": chunks,
+            }
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            _write_atomic(self._manifest_path(snapshot_id),
+                          json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+            self.rotate()
+            return snapshot_id
+
+    def rotate(self):
+        """Drop snapshots beyond `keep` and the chunks only they referenced"""
+        existing = self.snapshots()
+        expired = existing[:-self.keep] if self.keep > 0 else []
+        if not expired:
+            return
+        for snapshot_id in expired:
+            os.remove(self._manifest_path(snapshot_id))
+
+        referenced = set()
+        for snapshot_id in existing[len(expired):]:
+            referenced.update(self.manifest(snapshot_id)["chunks"])
+        for prefix in os.listdir(self.chunk_dir):
+            prefix_dir = os.path.join(self.chunk_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+
+    def restore(self, tasks_file, snapshot_id=None):
+        """Rebuild `tasks_file` from a snapshot (default: latest); return its id"""
+        with self._lock:
+            existing = self.snapshots()
+            if not existing:
+                raise ValueError("No snapshots available")
+            snapshot_id = snapshot_id or existing[-1]
+            if snapshot_id not in existing:
+                raise ValueError(f"Unknown snapshot: {snapshot_id}")
+
+            manifest = self.manifest(snapshot_id)
+            data = b"".join(self.read_chunk(digest) for digest in manifest["chunks"])
+            if hashlib.sha256(data).hexdigest() != manifest["sha256"]:
+                raise ValueError(f"Snapshot {snapshot_id} is damaged")
+            _write_atomic(tasks_file, data)
+            return snapshot_id
+
+    def read_chunk(self, digest):
+        """Return the bytes of a stored chunk"""
+        with open(self._chunk_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def disk_usage(self):
+        """Return the bytes used by stored chunks"""
+        total = 0
+        if os.path.isdir(self.chunk_dir):
+            for prefix in os.listdir(self.chunk_dir):
+                prefix_dir = os.path.join(self.chunk_dir, prefix)
+                total += sum(os.path.getsize(os.path.join(prefix_dir, name))
+                             for name in os.listdir(prefix_dir))
+        return total
+
+    def snapshot_in_background(self, tasks_file, on_error=None):
+        """Take a snapshot on a worker thread; skipped if one is already running"""
+        if self._lock.locked():
+            return None
+        return self._start(lambda: self.snapshot(tasks_file), None, on_error)
+
+    def restore_in_background(self, tasks_file, snapshot_id, on_done=None, on_error=None):
+        """Snapshot the current file, then restore `snapshot_id`, on a worker thread
+
+        `on_done(snapshot_id)` and `on_error(exception)` run on the worker thread.
+        """
+        def run():
+            # Keep the list being replaced restorable too
+            self.snapshot(tasks_file)
+            return self.restore(tasks_file, snapshot_id)
+
+        return self._start(run, on_done, on_error)
+
+    def _start(self, work, on_done, on_error):
+        def run():
+            try:
+                result = work()
+            except Exception as e:
+                print(f"Error in backup: {e}")
+                if on_error:
+                    on_error(e)
+            else:
+                if on_done:
+                    on_done(result)
+
+        worker = threading.Thread(target=run, name="todo-backup", daemon=True)
+        worker.start()
+        self._worker = worker
+        return worker
+
+    def wait(self, timeout=None):
+        """Wait up to `timeout` seconds for the latest worker; True if it finished"""
+        worker = self._worker
+        if worker is None:
+            return True
+        worker.join(timeout)
+        return not worker.is_alive()
+
+
+def _write_atomic(path, data):
+    """Write bytes to a temporary file and swap it into place"""
+    # A unique temporary name, so a save from the UI thread never shares it
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def main():
+    """Snapshot, list or restore backups from the command line"""
+    parser = argparse.ArgumentParser(description="Manage to-do list backups")
+    parser.add_argument("action", choices=["snapshot", "list", "restore"])
+    parser.add_argument("snapshot_id", nargs="?", help="snapshot to restore (default: latest)")
+    parser.add_argument("--tasks-file", default="pixel_todo_tasks.json")
+    parser.add_argument("--backup-dir", default="pixel_todo_backups")
+    parser.add_argument("--keep", type=int, default=48, help="snapshots to keep (default: 48)")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.backup_dir, args.keep)
+    try:
+        if args.action == "snapshot":
+            snapshot_id = store.snapshot(args.tasks_file)
+            print(f"⭐ Created snapshot {snapshot_id}" if snapshot_id
+                  else "🌙 No changes since the last snapshot")
+        elif args.action == "list":
+            for snapshot_id in store.snapshots():
+                manifest = store.manifest(snapshot_id)
+                print(f"{snapshot_id}  {manifest['size']:>10} bytes  "
+                      f"{len(manifest['chunks'])} chunks")
+            print(f"Chunk store: {store.disk_usage()} bytes")
+        else:
+            snapshot_id = store.restore(args.tasks_file, args.snapshot_id)
+            print(f"⭐ Restored {args.tasks_file} from snapshot {snapshot_id}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Quick-add autocomplete for the Nighttime To-Do List.
+
+Every task typed into the input is remembered in `pixel_todo_history.json`
+with a score mixing how often and how recently it was entered. Scores use
+forward decay: an entry made at time t weighs 2 ** ((t - EPOCH) / HALF_LIFE),
+kept as a log2 sum so it never overflows and never needs rescaling, and
+ordering by it is the same as ordering by exponentially decayed frequency.
+
+Entries are kept sorted by their lower-cased text, so the entries under
+a prefix are one contiguous slice. Trie nodes (prefix -> best completions)
+are expanded lazily from that slice the first time a prefix is typed and
+then kept up to date as tasks are added, so a lookup is a dict hit.
+Only the sorted entries and scores are saved; nothing is rebuilt on startup.
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import time
+
+HISTORY_EPOCH = 1_700_000_000
+HALF_LIFE = 30 * 24 * 3600  # an entry counts half as much after a month
+SUGGESTIONS = 8
+
+
+def _decayed(score, timestamp):
+    """Add one entry made at `timestamp` to a log2 score"""
+    weight = (timestamp - HISTORY_EPOCH) / HALF_LIFE
+    if score is None:
+        return weight
+    high, low = max(score, weight), min(score, weight)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+class TaskHistory:
+    """Frequency- and recency-ranked task history with prefix completion"""
+
+    def __init__(self, history_file="pixel_todo_history.json", limit=SUGGESTIONS):
+        self.history_file = history_file
+        self.limit = limit
+        self.keys = []    # lower-cased text, sorted
+        self.texts = []   # text as last typed
+        self.scores = []  # log2 of the decayed entry count
+        self.nodes = {}   # prefix -> [(score, key)], best first
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self):
+        """Load saved history; returns False if there was none"""
+        if not os.path.exists(self.history_file):
+            return False
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            texts, scores = data["texts"], data["scores"]
+            if len(texts) != len(scores):
+                raise ValueError("texts and scores differ in length")
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            print(f"Error loading task history: {e}")
+            return False
+        self.texts = list(texts)
+        self.keys = [text.lower() for text in self.texts]
+        self.scores = [float(score) for score in scores]
+        self.nodes.clear()
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Write the history atomically if it changed"""
+        if not self.dirty:
+            return
+        tmp_file = self.history_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"texts": self.texts,
+                       "scores": [round(score, 4) for score in self.scores]},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.history_file)
+        self.dirty = False
+
+    def seed(self, entries):
+        """Build the history from (text, timestamp) pairs in one pass"""
+        merged = {}
+        for text, timestamp in entries:
+            text = " ".join(text.split())
+            if not text:
+                continue
+            key = text.lower()
+            previous = merged.get(key)
+            merged[key] = (text, _decayed(previous[1] if previous else None,
+                                          timestamp or time.time()))
+        self.keys = sorted(merged)
+        self.texts = [merged[key][0] for key in self.keys]
+        self.scores = [merged[key][1] for key in self.keys]
+        self.nodes.clear()
+        self.dirty = bool(self.keys)
+
+    def add(self, text, timestamp=None):
+        """Record one entry of `text`, updating the expanded nodes on its path"""
+        text = " ".join(text.split())
+        if not text:
+            return
+        key = text.lower()
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            score = self.scores[index] = _decayed(self.scores[index],
+                                                   timestamp or time.time())
+            self.texts[index] = text
+        else:
+            score = _decayed(None, timestamp or time.time())
+            self.keys.insert(index, key)
+            self.texts.insert(index, text)
+            self.scores.insert(index, score)
+        self.dirty = True
+
+        # Scores only grow, so a node either already holds the key or gains it
+        for end in range(len(key) + 1):
+            best = self.nodes.get(key[:end])
+            if best is None:
+                continue
+            best[:] = [entry for entry in best if entry[1] != key]
+            best.append((score, key))
+            best.sort(reverse=True)
+            del best[self.limit:]
+
+    def _expand(self, prefix):
+        """Compute the best completions for `prefix` from the sorted entries"""
+        parent = self.nodes.get(prefix[:-1]) if prefix else None
+        if parent is not None and len(parent) < self.limit:
+            # The parent already holds every entry under it
+            return [entry for entry in parent if entry[1].startswith(prefix)]
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        scores, keys = self.scores, self.keys
+        return heapq.nlargest(self.limit,
+                              ((scores[index], keys[index]) for index in range(start, end)))
+
+    def complete(self, prefix):
+        """Return up to `limit` past tasks starting with `prefix`, best first"""
+        words = prefix.split()
+        if not words:
+            return []
+        # Inner whitespace collapses as in add(); a typed word boundary is kept
+        prefix = (" ".join(words) + (" " if prefix[-1].isspace() else "")).lower()
+        best = self.nodes.get(prefix)
+        if best is None:
+            best = self.nodes[prefix] = self._expand(prefix)
+        texts, keys = self.texts, self.keys
+        return [texts[bisect.bisect_left(keys, key)] for _, key in best]
@@ -0,0 +1,363 @@
+"""
+Streaming import/export for the Nighttime To-Do List.
+
+Tasks move in and out as CSV, Markdown `- [ ]` checklists and todo.txt.
+Every reader is a generator yielding TaskRecord objects and every writer
+consumes an iterable, so files of any size flow through in constant
+memory. The task file itself is also read and written incrementally.
+
+Usage:
+    python3 todo_io.py import FILE [--format FMT] [--tasks-file PATH]
+    python3 todo_io.py export FILE [--format FMT] [--tasks-file PATH]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+
+from todo_records import TaskRecord, new_task_id
+from todo_recurrence import RecurrenceRule, parse_recurrence
+from todo_tags import format_tags, parse_tags
+
+BATCH_SIZE = 1000
+
+FORMATS = {
+    ".csv": "csv",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".txt": "todotxt",
+    ".json": "json",
+}
+
+CSV_FIELDS = ["text", "completed", "created_at", "completed_at", "tags", "recur"]
+
+MARKDOWN_ITEM = re.compile(r"^\s*[-*+]\s+\[([ xX])\]\s+(.*?)\s*$")
+TODOTXT_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# The CSV `recur` column keeps the whole rule: "@monthly from 2024-01-31 next 2024-03-31"
+CSV_RECUR_DATES = re.compile(r"\s+from\s+(\d{4}-\d{2}-\d{2})\s+next\s+(\d{4}-\d{2}-\d{2})\s*$")
+TODOTXT_PRIORITY = re.compile(r"^\([A-Z]\)$")
+
+# The C-accelerated encoder; json.dumps(indent=...) falls back to pure Python
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def detect_format(path):
+    """Guess the file format from its extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type: {ext or path}")
+    return FORMATS[ext]
+
+
+def batched(iterable, size=BATCH_SIZE):
+    """Yield lists of up to `size` items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+@lru_cache(maxsize=4096)
+def _timestamp(day):
+    """Local-midnight timestamp for a YYYY-MM-DD string"""
+    return int(datetime.strptime(day, "%Y-%m-%d").timestamp())
+
+
+def _day(timestamp):
+    """YYYY-MM-DD string for a timestamp"""
+    return date.fromtimestamp(timestamp).isoformat()
+
+
+def _tagged_record(text, completed=False, created_at=None, completed_at=None):
+    """Build a record, lifting inline `@rule` and `#tags` out of the text"""
+    text, recur = parse_recurrence(text)
+    text, tags = parse_tags(text)
+    return TaskRecord(text, completed, created_at, completed_at, tags, recur)
+
+
+def tagged_text(record):
+    """Task text with its recurrence and tags written back inline"""
+    parts = [record.text]
+    if record.recur is not None:
+        parts.append(record.recur.token())
+    if record.tags:
+        parts.append(format_tags(record.tags))
+    return " ".join(parts)
+
+
+def _optional_int(value):
+    """Parse an optional integer CSV cell"""
+    value = (value or "").strip()
+    return int(float(value)) if value else None
+
+
+# Readers: each takes an open text file and yields TaskRecord objects
+
+def read_json(f, chunk_size=1 << 16):
+    """Stream entries out of a task file's top-level JSON array"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, opened = "", 0, False, False
+    while True:
+        # Skip separators, topping the buffer up when it runs dry
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                break
+            buffer, pos = f.read(chunk_size), 0
+            eof = not buffer
+            continue
+        if not opened:
+            if buffer[pos] != "[":
+                raise ValueError("Task file must contain a JSON list")
+            opened, pos = True, pos + 1
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            task, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Entry straddles the chunk boundary: keep the tail and read on
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        record = TaskRecord.from_data(task)
+        if record is not None:
+            yield record
+        pos = end
+    if opened:
+        raise ValueError("Task file ends before its JSON list is closed")
+
+
+def read_csv(f):
+    """Stream tasks from CSV with a `text` column (or text in the first column)"""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [name.strip().lower() for name in header]
+    if "text" not in columns:
+        # Headerless file: first column is the task text
+        columns = ["text"]
+        rows = ([header], reader)
+    else:
+        rows = (reader,)
+    for source in rows:
+        for row in source:
+            fields = dict(zip(columns, row))
+            text = fields.get("text", "").strip()
+            if not text:
+                continue
+            completed = fields.get("completed", "").strip().lower() in ("1", "true", "yes", "x")
+            recur = fields.get("recur", "").strip()
+            dates = CSV_RECUR_DATES.search(recur)
+            if dates:
+                recur = recur[:dates.start()]
+            inline = " ".join((recur, fields.get("tags", "").strip()))
+            record = _tagged_record(f"{text} {inline}".strip(), completed,
+                                    _optional_int(fields.get("created_at")),
+                                    _optional_int(fields.get("completed_at")))
+            if dates and record.recur is not None:
+                # Keep the original anchor and due day instead of restarting today
+                try:
+                    record.recur = RecurrenceRule(
+                        record.recur.kind, record.recur.interval,
+                        date.fromisoformat(dates.group(1)), date.fromisoformat(dates.group(2)))
+                except ValueError:
+                    pass
+            yield record
+
+
+def read_markdown(f):
+    """Stream tasks from `- [ ]` / `- [x]` checklist lines"""
+    for line in f:
+        match = MARKDOWN_ITEM.match(line)
+        if match and match.group(2):
+            yield _tagged_record(match.group(2), match.group(1) != " ")
+
+
+def read_todotxt(f):
+    """Stream tasks from todo.txt lines (completion, priority and dates)"""
+    for line in f:
+        words = line.split()
+        if not words:
+            continue
+        completed = words[0] == "x" and len(words) > 1
+        completed_at = created_at = None
+        if completed:
+            words = words[1:]
+            if words and TODOTXT_DATE.match(words[0]):
+                completed_at = _timestamp(words.pop(0))
+        if words and TODOTXT_PRIORITY.match(words[0]):
+            words = words[1:]
+        if words and TODOTXT_DATE.match(words[0]):
+            created_at = _timestamp(words.pop(0))
+        text = " ".join(words)
+        if text:
+            yield _tagged_record(text, completed, created_at, completed_at)
+
+
+# Writers: each takes an iterable of TaskRecord objects and an open text file
+
+def write_json(records, f):
+    """Write records as the task file's JSON list, one entry at a time"""
+    encode = _ENCODER.encode
+    f.write("[")
+    first = True
+    for record in records:
+        # Same layout as json.dump(tasks, f, indent=2), built field by field
+        fields = ",\n    ".join(f"{encode(key)}: {encode(value)}"
+                                 for key, value in record.to_data().items())
+        f.write(("\n  {\n    " if first else ",\n  {\n    ") + fields + "\n  }")
+        first = False
+    f.write("]" if first else "\n]")
+
+
+def _recur_field(rule):
+    """The CSV `recur` column for a rule, anchor and due day included"""
+    if rule is None:
+        return ""
+    return f"{rule.token()} from {rule.anchor.isoformat()} next {rule.due.isoformat()}"
+
+
+def write_csv(records, f):
+    """Write records as CSV with a header row"""
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for record in records:
+        writer.writerow([record.text, "true" if record.completed else "false",
+                         "" if record.created_at is None else record.created_at,
+                         "" if record.completed_at is None else record.completed_at,
+                         format_tags(record.tags), _recur_field(record.recur)])
+
+
+def write_markdown(records, f):
+    """Write records as a Markdown checklist"""
+    for record in records:
+        f.write(f"- [{'x' if record.completed else ' '}] {tagged_text(record)}\n")
+
+
+def write_todotxt(records, f):
+    """Write records as todo.txt lines"""
+    for record in records:
+        parts = []
+        if record.completed:
+            parts.append("x")
+            if record.completed_at is not None:
+                parts.append(_day(record.completed_at))
+        if record.created_at is not None:
+            parts.append(_day(record.created_at))
+        parts.append(tagged_text(record))
+        f.write(" ".join(parts) + "\n")
+
+
+READERS = {
+    "json": read_json,
+    "csv": read_csv,
+    "markdown": read_markdown,
+    "todotxt": read_todotxt,
+}
+
+WRITERS = {
+    "json": write_json,
+    "csv": write_csv,
+    "markdown": write_markdown,
+    "todotxt": write_todotxt,
+}
+
+
+def iter_file(path, fmt=None):
+    """Stream the records stored in a file"""
+    reader = READERS[fmt or detect_format(path)]
+    newline = "" if reader is read_csv else None
+    # utf-8-sig drops the byte order mark Excel's "CSV UTF-8" (and Notepad) put first
+    with open(path, 'r', encoding='utf-8-sig', newline=newline) as f:
+        yield from reader(f)
+
+
+def write_file(records, path, fmt=None):
+    """Stream records into a file, replacing it only once fully written"""
+    writer = WRITERS[fmt or detect_format(path)]
+    newline = "" if writer is write_csv else None
+    # A unique temporary name, so writers on other threads never share it
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            writer(records, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def import_file(path, tasks_file="pixel_todo_tasks.json", fmt=None, batch_size=BATCH_SIZE):
+    """Append the tasks in `path` to the task file; return how many were added"""
+    imported = 0
+
+    def records():
+        nonlocal imported
+        if os.path.exists(tasks_file):
+            yield from iter_file(tasks_file, "json")
+        for batch in batched(iter_file(path, fmt), batch_size):
+            for record in batch:
+                # Imported tasks are new tasks, whatever ids the file carried
+                record.id, record.has_notes = new_task_id(), False
+            imported += len(batch)
+            yield from batch
+
+    write_file(records(), tasks_file, "json")
+    return imported
+
+
+def export_file(path, tasks_file="pixel_todo_tasks.json", fmt=None):
+    """Write the task file's tasks to `path`; return how many were written"""
+    exported = 0
+
+    def records():
+        nonlocal exported
+        if os.path.exists(tasks_file):
+            for record in iter_file(tasks_file, "json"):
+                exported += 1
+                yield record
+
+    write_file(records(), path, fmt)
+    return exported
+
+
+def main():
+    """Scriptable import/export entry point"""
+    parser = argparse.ArgumentParser(description="Import or export to-do tasks")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("file", help="CSV, Markdown (.md) or todo.txt (.txt) file")
+    parser.add_argument("--format", choices=sorted(READERS), help="override format detection")
+    parser.add_argument("--tasks-file", default="pixel_todo_tasks.json",
+                        help="task file to read or update (default: pixel_todo_tasks.json)")
+    args = parser.parse_args()
+
+    try:
+        if args.action == "import":
+            count = import_file(args.file, args.tasks_file, args.format)
+            print(f"⭐ Imported {count} task(s) into {args.tasks_file}")
+        else:
+            count = export_file(args.file, args.tasks_file, args.format)
+            print(f"⭐ Exported {count} task(s) to {args.file}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Memory report for the Nighttime To-Do List.
+
+Measures how many bytes each task costs, so deployments with very large
+lists can be sized. Python allocations are traced with tracemalloc; Qt's
+C++ heap is invisible to tracemalloc, so widget measurements also report
+the growth of the process's peak resident set size.
+
+Usage:
+    python3 todo_memory.py [TASKS_FILE] [--tasks N] [--widgets]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from todo_records import TaskRecord
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def traced_bytes(build):
+    """Return (result, bytes still allocated by build())"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = build()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return result, sum(stat.size_diff for stat in stats)
+
+
+def sample_tasks(tasks_file, count):
+    """Task entries to measure: the real file if present, repeated up to count"""
+    tasks = []
+    if tasks_file and os.path.exists(tasks_file):
+        with open(tasks_file, 'r', encoding='utf-8') as f:
+            tasks = [task for task in json.load(f) if TaskRecord.from_data(task)]
+    if not tasks:
+        tasks = [{"text": f"task {i % 100}", "completed": i % 3 == 0} for i in range(100)]
+    # Decode fresh copies so repeated texts are separate strings, as json.load yields them
+    encoded = [json.dumps(tasks[i % len(tasks)]) for i in range(count)]
+    return encoded
+
+
+def measure_records(encoded):
+    """Bytes per task as plain dicts versus slot-based, interned records"""
+    _, dict_bytes = traced_bytes(lambda: [json.loads(line) for line in encoded])
+    _, record_bytes = traced_bytes(
+        lambda: [TaskRecord.from_data(json.loads(line)) for line in encoded])
+    return dict_bytes, record_bytes
+
+
+def measure_widgets(encoded, low_memory):
+    """Bytes per task for a loaded window, normal or low-memory mode"""
+    import tempfile
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QEvent
+    from PyQt6.QtWidgets import QApplication
+    import todolist
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    # The window also writes its stats, history and backups here
+    workdir = tempfile.TemporaryDirectory(prefix="todo_memory_")
+    with open(os.path.join(workdir.name, "pixel_todo_tasks.json"), 'w', encoding='utf-8') as f:
+        f.write("[" + ",".join(encoded) + "]")
+
+    cwd = os.getcwd()
+    os.chdir(workdir.name)
+    saved_env = os.environ.get("PIXEL_TODO_LOW_MEMORY")
+    os.environ["PIXEL_TODO_LOW_MEMORY"] = "1" if low_memory else "0"
+    saved_threshold = todolist.PixelTodoApp.LOW_MEMORY_THRESHOLD
+    if not low_memory:
+        todolist.PixelTodoApp.LOW_MEMORY_THRESHOLD = len(encoded) + 1
+    try:
+        rss_before = peak_rss_bytes()
+        window, python_bytes = traced_bytes(todolist.PixelTodoApp)
+        window.show()
+        app.processEvents()
+        rss_after = peak_rss_bytes()
+        # Free the window before the next measurement so it is not counted twice
+        window._allow_close = True
+        window.backup_after_save.stop()
+        window.hide()
+        window.deleteLater()
+        app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        app.processEvents()
+    finally:
+        todolist.PixelTodoApp.LOW_MEMORY_THRESHOLD = saved_threshold
+        if saved_env is None:
+            os.environ.pop("PIXEL_TODO_LOW_MEMORY", None)
+        else:
+            os.environ["PIXEL_TODO_LOW_MEMORY"] = saved_env
+        os.chdir(cwd)
+        workdir.cleanup()
+    rss = None if rss_before is None else rss_after - rss_before
+    return python_bytes, rss
+
+
+def main():
+    """Print a bytes-per-task report"""
+    parser = argparse.ArgumentParser(description="Report memory used per task")
+    parser.add_argument("tasks_file", nargs="?", default="pixel_todo_tasks.json",
+                        help="task file to sample texts from")
+    parser.add_argument("--tasks", type=int, default=10000,
+                        help="number of tasks to measure (default: 10000)")
+    parser.add_argument("--widgets", action="store_true",
+                        help="also measure a loaded window (needs PyQt6)")
+    args = parser.parse_args()
+
+    count = max(1, args.tasks)
+    encoded = sample_tasks(args.tasks_file, count)
+    dict_bytes, record_bytes = measure_records(encoded)
+
+    print(f"🌙 Memory report for {count} tasks")
+    print(f"  {'dict per task:':30}{dict_bytes / count:10.1f} bytes")
+    print(f"  {'TaskRecord per task:':30}{record_bytes / count:10.1f} bytes")
+
+    if args.widgets:
+        # Low-memory first: peak RSS only grows, so the larger run goes last
+        for label, low_memory in (("low-memory window", True), ("full window", False)):
+            python_bytes, rss = measure_widgets(encoded, low_memory)
+            line = f"  {label + ' per task:':30}{python_bytes / count:10.1f} bytes (Python)"
+            if rss is not None:
+                line += f", {rss / count:.1f} bytes (peak RSS growth)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
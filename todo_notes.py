@@ -0,0 +1,120 @@
+"""
+Out-of-line task notes and attachments for the Nighttime To-Do List.
+
+Notes and attached files can be any size, so they are kept out of
+`pixel_todo_tasks.json`: each task with details gets a directory under
+`pixel_todo_notes/`, named by the task's id, holding `note.md` and an
+`attachments/` folder. The task list only carries the id and a
+`has_notes` flag, and the content is read when a task's notes are opened.
+"""
+
+import os
+import shutil
+
+NOTE_FILE = "note.md"
+ATTACHMENT_DIR = "attachments"
+
+
+class NoteStore:
+    """Blob store for task notes and attachments, keyed by task id"""
+
+    def __init__(self, notes_dir="pixel_todo_notes"):
+        self.notes_dir = notes_dir
+
+    def task_dir(self, task_id):
+        if not task_id or task_id != os.path.basename(task_id) or task_id.startswith("."):
+            raise ValueError(f"Invalid task id: {task_id!r}")
+        return os.path.join(self.notes_dir, task_id)
+
+    def _attachment_dir(self, task_id):
+        return os.path.join(self.task_dir(task_id), ATTACHMENT_DIR)
+
+    def has_content(self, task_id):
+        """True if the task has a note or any attachment, without reading either"""
+        try:
+            if os.path.getsize(os.path.join(self.task_dir(task_id), NOTE_FILE)) > 0:
+                return True
+        except FileNotFoundError:
+            pass
+        try:
+            with os.scandir(self._attachment_dir(task_id)) as entries:
+                return any(entry.is_file() for entry in entries)
+        except FileNotFoundError:
+            return False
+
+    def read_note(self, task_id):
+        """Return the task's note text ("" if none)"""
+        try:
+            with open(os.path.join(self.task_dir(task_id), NOTE_FILE), 'r',
+                      encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def write_note(self, task_id, text):
+        """Save the task's note atomically; an empty note removes the file"""
+        path = os.path.join(self.task_dir(task_id), NOTE_FILE)
+        if not text.strip():
+            if os.path.exists(path):
+                os.remove(path)
+            self._prune(task_id)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def attachments(self, task_id):
+        """Return [(name, size in bytes)] of the task's attachments"""
+        attachment_dir = self._attachment_dir(task_id)
+        if not os.path.isdir(attachment_dir):
+            return []
+        return [(entry.name, entry.stat().st_size)
+                for entry in sorted(os.scandir(attachment_dir), key=lambda entry: entry.name)
+                if entry.is_file()]
+
+    def attachment_path(self, task_id, name):
+        """Filesystem path of one attachment"""
+        return os.path.join(self._attachment_dir(task_id), os.path.basename(name))
+
+    def add_attachment(self, task_id, source_path):
+        """Copy a file into the task's attachments; return the stored name"""
+        attachment_dir = self._attachment_dir(task_id)
+        os.makedirs(attachment_dir, exist_ok=True)
+        stem, ext = os.path.splitext(os.path.basename(source_path))
+        name, counter = stem + ext, 1
+        # Never overwrite an attachment that happens to share the name
+        while os.path.exists(os.path.join(attachment_dir, name)):
+            counter += 1
+            name = f"{stem} ({counter}){ext}"
+        shutil.copyfile(source_path, os.path.join(attachment_dir, name))
+        return name
+
+    def remove_attachment(self, task_id, name):
+        """Delete one attachment"""
+        path = self.attachment_path(task_id, name)
+        if os.path.exists(path):
+            os.remove(path)
+        self._prune(task_id)
+
+    def delete(self, task_id):
+        """Remove everything stored for a task"""
+        shutil.rmtree(self.task_dir(task_id), ignore_errors=True)
+
+    def disk_usage(self, task_id):
+        """Bytes used by a task's note and attachments"""
+        total = 0
+        for root, _, files in os.walk(self.task_dir(task_id)):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def _prune(self, task_id):
+        """Drop the task's directory once nothing is left in it"""
+        task_dir = self.task_dir(task_id)
+        attachment_dir = self._attachment_dir(task_id)
+        for path in (attachment_dir, task_dir):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass  # missing or not empty
@@ -0,0 +1,71 @@
+"""
+Compact task records for the Nighttime To-Do List.
+
+A task is a handful of fields, so it is kept in a slot-based record
+instead of a per-instance dict. Task text is interned: lists full of
+repeated entries ("breakfast", "study", ...) share one string object.
+"""
+
+import sys
+import uuid
+
+from todo_recurrence import RecurrenceRule
+
+
+def new_task_id():
+    """Return a fresh, globally unique task id"""
+    return uuid.uuid4().hex
+
+
+class TaskRecord:
+    """One task, independent of any widget showing it"""
+    __slots__ = ("text", "completed", "created_at", "completed_at", "tags", "recur",
+                 "id", "has_notes")
+
+    def __init__(self, text, completed=False, created_at=None, completed_at=None, tags=(),
+                 recur=None, id=None, has_notes=False):
+        self.text = sys.intern(text)
+        self.completed = bool(completed)
+        self.created_at = created_at
+        self.completed_at = completed_at if completed else None
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+        self.recur = recur  # RecurrenceRule for repeating tasks
+        # Notes and attachments live in the note store under the task's id
+        self.id = id
+        self.has_notes = bool(has_notes)
+
+    @classmethod
+    def from_data(cls, task):
+        """Build a record from a saved entry (old string or dict format)"""
+        if isinstance(task, str):
+            text = task.strip()
+            return cls(text) if text else None
+        if isinstance(task, dict):
+            text = str(task.get("text", "")).strip()
+            if text:
+                return cls(text, task.get("completed", False),
+                           task.get("created_at"), task.get("completed_at"),
+                           task.get("tags") or (),
+                           RecurrenceRule.from_data(task["recur"]) if "recur" in task else None,
+                           task.get("id"), task.get("has_notes", False))
+        return None
+
+    def to_data(self):
+        """Return the record as the dictionary stored in the task file"""
+        data = {
+            "text": self.text,
+            "completed": self.completed
+        }
+        if self.created_at is not None:
+            data["created_at"] = self.created_at
+        if self.completed_at is not None:
+            data["completed_at"] = self.completed_at
+        if self.tags:
+            data["tags"] = list(self.tags)
+        if self.recur is not None:
+            data["recur"] = self.recur.to_data()
+        if self.id is not None:
+            data["id"] = self.id
+        if self.has_notes:
+            data["has_notes"] = True
+        return data
@@ -0,0 +1,119 @@
+"""
+Recurring tasks for the Nighttime To-Do List.
+
+A recurring task stores only its rule: the kind, an interval, the anchor
+day it started from and the next due day. Occurrences are produced lazily
+by `occurrences()`, so nothing is ever materialized ahead of time, and
+completing an instance moves the due day forward in O(1).
+
+Rules are typed inline: `water plants @daily`, `standup @weekdays`,
+`backup @every 3 days`, `rent @monthly`.
+"""
+
+import calendar
+import re
+from datetime import date, timedelta
+from itertools import takewhile
+
+RULE_PATTERN = re.compile(
+    r"(?<!\S)@(daily|weekdays|monthly|every\s+(\d+)\s*days?)(?!\S)", re.IGNORECASE)
+
+
+class RecurrenceRule:
+    """Rule for a repeating task plus the day its next instance is due"""
+    __slots__ = ("kind", "interval", "anchor", "due")
+
+    KINDS = ("daily", "weekdays", "every", "monthly")
+
+    def __init__(self, kind, interval=1, anchor=None, due=None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown recurrence: {kind}")
+        self.kind = kind
+        self.interval = max(1, int(interval))
+        self.anchor = anchor or date.today()
+        self.due = due or self.next_on_or_after(self.anchor)
+
+    @classmethod
+    def from_data(cls, data):
+        """Build a rule from its saved dictionary, or None if malformed"""
+        try:
+            return cls(data["kind"], data.get("interval", 1),
+                       date.fromisoformat(data["anchor"]), date.fromisoformat(data["due"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def to_data(self):
+        """Return the rule as stored in the task file"""
+        data = {"kind": self.kind, "anchor": self.anchor.isoformat(), "due": self.due.isoformat()}
+        if self.kind == "every":
+            data["interval"] = self.interval
+        return data
+
+    def token(self):
+        """The inline `@rule` form of this rule"""
+        if self.kind == "every":
+            return f"@every {self.interval} days"
+        return f"@{self.kind}"
+
+    def describe(self):
+        """Short human description"""
+        if self.kind == "every":
+            return f"every {self.interval} days"
+        return self.kind
+
+    def next_on_or_after(self, day):
+        """First occurrence on or after `day`, computed in O(1)"""
+        day = max(day, self.anchor)
+        if self.kind == "daily":
+            return day
+        if self.kind == "weekdays":
+            # Saturday and Sunday roll forward to Monday
+            return day + timedelta(days=7 - day.weekday()) if day.weekday() >= 5 else day
+        if self.kind == "every":
+            offset = (day - self.anchor).days % self.interval
+            return day + timedelta(days=(self.interval - offset) % self.interval)
+        # Monthly: same day of month as the anchor, clamped to short months
+        year, month = day.year, day.month
+        candidate = _month_day(year, month, self.anchor.day)
+        if candidate < day:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            candidate = _month_day(year, month, self.anchor.day)
+        return candidate
+
+    def occurrences(self, start=None):
+        """Lazily yield occurrence days from the due day (or `start`) onward"""
+        day = self.next_on_or_after(start or self.due)
+        while True:
+            yield day
+            day = self.next_on_or_after(day + timedelta(days=1))
+
+    def upcoming(self, until):
+        """Occurrences from the due day up to and including `until`"""
+        return list(takewhile(lambda day: day <= until, self.occurrences()))
+
+    def advance(self, today=None):
+        """Mark the due instance done: move `due` to the next occurrence"""
+        today = today or date.today()
+        # Completing late skips the missed instances instead of replaying them
+        self.due = self.next_on_or_after(max(self.due, today) + timedelta(days=1))
+        return self.due
+
+
+def _month_day(year, month, day):
+    """`day` of the given month, clamped to the month's length"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def parse_recurrence(text, today=None):
+    """Split `text` into (text without the rule, RecurrenceRule or None)"""
+    match = RULE_PATTERN.search(text)
+    if not match:
+        return text, None
+    word = match.group(1).lower()
+    if word.startswith("every"):
+        rule = RecurrenceRule("every", int(match.group(2)), today)
+    else:
+        rule = RecurrenceRule(word, 1, today)
+    stripped = " ".join((text[:match.start()] + " " + text[match.end():]).split())
+    # A task made only of the rule keeps its text as typed
+    return (stripped or text), rule
@@ -0,0 +1,182 @@
+"""
+Productivity statistics for the Nighttime To-Do List.
+
+Completions are rolled up per day as they happen and kept in
+`pixel_todo_stats.json`, so the statistics panel never has to scan the
+task file. The rollups live in `array` columns; when NumPy is available
+the history queries run vectorized over the same buffers.
+"""
+
+import json
+import os
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to plain Python loops
+    np = None
+
+
+def _column(values):
+    """View an array column as a NumPy array without copying"""
+    if not values:
+        return np.zeros(0, dtype=values.typecode)
+    return np.frombuffer(values, dtype=values.typecode)
+
+
+class DailyRollup:
+    """Per-day completion counts and time-to-complete totals"""
+
+    def __init__(self, stats_file="pixel_todo_stats.json"):
+        self.stats_file = stats_file
+        self.days = array('l')        # date ordinals, sorted ascending
+        self.completed = array('l')   # completions recorded on that day
+        self.durations = array('d')   # summed seconds from creation to completion
+        self.timed = array('l')       # completions that had a creation time
+        self.load()
+
+    def load(self):
+        """Load rollups from disk, starting empty if the file is missing"""
+        if not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.days = array('l', data.get("days", []))
+            self.completed = array('l', data.get("completed", []))
+            self.durations = array('d', data.get("durations", []))
+            self.timed = array('l', data.get("timed", []))
+        except (ValueError, TypeError, OSError) as e:
+            print(f"Error loading statistics: {e}")
+            self.days, self.completed = array('l'), array('l')
+            self.durations, self.timed = array('d'), array('l')
+
+    def save(self):
+        """Write rollups to disk atomically"""
+        data = {
+            "days": self.days.tolist(),
+            "completed": self.completed.tolist(),
+            "durations": self.durations.tolist(),
+            "timed": self.timed.tolist(),
+        }
+        tmp_file = self.stats_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_file, self.stats_file)
+
+    def record(self, completed_at, created_at=None, delta=1):
+        """Add (delta=1) or retract (delta=-1) one completion in its day bucket"""
+        day = date.fromtimestamp(completed_at).toordinal()
+        idx = bisect_left(self.days, day)
+        if idx == len(self.days) or self.days[idx] != day:
+            if delta < 0:
+                return  # nothing recorded for that day, nothing to retract
+            self.days.insert(idx, day)
+            self.completed.insert(idx, 0)
+            self.durations.insert(idx, 0.0)
+            self.timed.insert(idx, 0)
+        self.completed[idx] = max(0, self.completed[idx] + delta)
+        if created_at is not None and completed_at >= created_at:
+            self.durations[idx] = max(0.0, self.durations[idx] + delta * (completed_at - created_at))
+            self.timed[idx] = max(0, self.timed[idx] + delta)
+
+    def per_day(self, count=7, today=None):
+        """Return [(date, completions)] for the last `count` days"""
+        end = (today or date.today()).toordinal()
+        start = end - count + 1
+        lo = bisect_left(self.days, start)
+        hi = bisect_left(self.days, end + 1)
+        if np is not None:
+            totals = np.zeros(count, dtype=np.int64)
+            days = _column(self.days)[lo:hi]
+            totals[days - start] = _column(self.completed)[lo:hi]
+            totals = totals.tolist()
+        else:
+            totals = [0] * count
+            for i in range(lo, hi):
+                totals[self.days[i] - start] = self.completed[i]
+        return [(date.fromordinal(start + i), totals[i]) for i in range(count)]
+
+    def per_week(self, count=4, today=None):
+        """Return [(week start date, completions)] for the last `count` weeks"""
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        start = monday.toordinal() - 7 * (count - 1)
+        lo = bisect_left(self.days, start)
+        hi = bisect_left(self.days, today.toordinal() + 1)
+        if np is not None:
+            days = _column(self.days)[lo:hi]
+            counts = _column(self.completed)[lo:hi]
+            totals = np.bincount((days - start) // 7, weights=counts, minlength=count)
+            totals = [int(t) for t in totals[:count]]
+        else:
+            totals = [0] * count
+            for i in range(lo, hi):
+                totals[(self.days[i] - start) // 7] += self.completed[i]
+        return [(date.fromordinal(start + 7 * i), totals[i]) for i in range(count)]
+
+    def streaks(self, today=None):
+        """Return (current streak, longest streak) in days with completions"""
+        today_ord = (today or date.today()).toordinal()
+        if np is not None:
+            days = _column(self.days)
+            counts = _column(self.completed)
+            active = days[counts > 0]
+            if active.size == 0:
+                return 0, 0
+            # Runs of consecutive ordinals: split wherever the gap exceeds one day
+            breaks = np.flatnonzero(np.diff(active) != 1) + 1
+            bounds = np.concatenate(([0], breaks, [active.size]))
+            runs = np.diff(bounds)
+            longest = int(runs.max())
+            last_day, last_run = int(active[-1]), int(runs[-1])
+        else:
+            longest = run = 0
+            last_day = None
+            for day, done in zip(self.days, self.completed):
+                if done <= 0:
+                    continue
+                run = run + 1 if last_day is not None and day == last_day + 1 else 1
+                longest = max(longest, run)
+                last_day = day
+            if last_day is None:
+                return 0, 0
+            last_run = run
+        # A streak is still alive if the last active day is today or yesterday
+        current = last_run if today_ord - last_day <= 1 else 0
+        return current, longest
+
+    def average_completion_seconds(self):
+        """Return the mean time-to-complete in seconds, or None if unknown"""
+        if np is not None:
+            timed = int(_column(self.timed).sum())
+            total = float(_column(self.durations).sum())
+        else:
+            timed = sum(self.timed)
+            total = sum(self.durations)
+        return total / timed if timed else None
+
+    def summary(self, today=None):
+        """Collect everything the statistics panel shows"""
+        current, longest = self.streaks(today)
+        return {
+            "per_day": self.per_day(7, today),
+            "per_week": self.per_week(4, today),
+            "current_streak": current,
+            "longest_streak": longest,
+            "average_seconds": self.average_completion_seconds(),
+            "total": sum(self.completed),
+        }
+
+
+def format_duration(seconds):
+    """Format a duration in seconds as a short human string"""
+    if seconds is None:
+        return "n/a"
+    if seconds < 3600:
+        return f"{max(1, round(seconds / 60))} min"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.1f} days"
@@ -0,0 +1,374 @@
+"""
+Offline multi-device sync for the Nighttime To-Do List.
+
+Devices sync through a shared folder (any synced or network directory).
+Each device appends its changes to its own `<device>.log` there, one JSON
+line per changed task:
+
+    {"c": 42, "t": "<task id>", "f": {"completed": true, "completed_at": 1718000000}}
+
+`c` is the device's Lamport clock. Every (task, field) pair is a
+last-writer-wins register stamped (clock, device), so replaying the logs
+in any order on any device ends in the same state: concurrent edits to
+different fields both survive, and edits to the same field are decided
+by the stamp. Deleting a task writes a `deleted` tombstone, which no
+later edit undoes.
+
+Changes are logged as they are made (`log_records`, `log_deleted`), and
+`pull` reads only the log bytes other devices added since the last pull,
+so the work per sync follows the number of changes, not the list size.
+The device id, clock, read offsets and registers live in a small SQLite
+database (`pixel_todo_sync.db`) outside the shared folder, where each
+change rewrites only the rows it touches.
+
+Usage:
+    python3 todo_sync.py SYNC_DIR [--tasks-file FILE] [--state-file FILE]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import uuid
+
+from todo_records import TaskRecord, new_task_id
+
+# Task fields kept in step across devices (the id is the task's key); notes
+# stay on the device they were written on, so `has_notes` is not among them
+FIELDS = ("text", "completed", "created_at", "completed_at", "tags", "recur")
+TOMBSTONE = "deleted"
+LOG_SUFFIX = ".log"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS offsets (device TEXT PRIMARY KEY, position INTEGER);
+CREATE TABLE IF NOT EXISTS registers (
+    task TEXT, field TEXT, clock INTEGER, device TEXT, value TEXT,
+    PRIMARY KEY (task, field)
+) WITHOUT ROWID;
+"""
+
+# Ids for tasks saved before they had one are derived from their content the
+# first time sync runs, so devices that start from copies of one file agree
+_LEGACY_NAMESPACE = uuid.UUID("6f1c2b4e-8d0a-4c55-9a3e-7b2f1d9e4c10")
+
+
+def _legacy_task_id(record, taken):
+    """Deterministic id for a task that has none yet"""
+    for duplicate in range(len(taken) + 1):
+        name = f"{record.created_at}\x1f{record.text}\x1f{duplicate}"
+        task_id = uuid.uuid5(_LEGACY_NAMESPACE, name).hex
+        if task_id not in taken:
+            return task_id
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+class SyncLog:
+    """Change-log replication between devices sharing `sync_dir`"""
+
+    def __init__(self, sync_dir, state_file="pixel_todo_sync.db"):
+        self.sync_dir = sync_dir
+        self.state_file = state_file
+        # Set when a change could not be logged; the next reconcile() picks it up
+        self.dirty = False
+        self._db = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.state_file)
+            self._db.executescript(SCHEMA)
+            if self._meta("device") is None:
+                with self._db:
+                    self._set_meta("device", uuid.uuid4().hex[:12])
+                    self._set_meta("clock", 0)
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def device(self):
+        return self._meta("device")
+
+    def _registers(self, task_id):
+        """{field: (clock, device, encoded value)} for one task"""
+        return {field: (clock, device, value) for field, clock, device, value in self.db.execute(
+            "SELECT field, clock, device, value FROM registers WHERE task = ?", (task_id,))}
+
+    def _log_path(self, device):
+        return os.path.join(self.sync_dir, device + LOG_SUFFIX)
+
+    def _write(self, entries, clock):
+        """Store the registers for `entries` and append them to this device's log"""
+        device = self.device
+        try:
+            with self.db:
+                for entry in entries:
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO registers VALUES (?, ?, ?, ?, ?)",
+                        [(entry["t"], field, entry["c"], device, _encode(value))
+                         for field, value in entry["f"].items()])
+                self._set_meta("clock", clock)
+                # The log is appended inside the transaction: if it fails, the
+                # registers roll back and the change is logged again later
+                os.makedirs(self.sync_dir, exist_ok=True)
+                with open(self._log_path(device), 'a', encoding='utf-8') as f:
+                    f.write("".join(json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+                                    + "\n" for entry in entries))
+                    f.flush()
+                    os.fsync(f.fileno())
+        except (OSError, sqlite3.Error):
+            self.dirty = True
+            raise
+
+    def _diff(self, record, registers, clock):
+        """Log entry for the fields of `record` that differ from its registers, or None"""
+        data = record.to_data()
+        fields = {}
+        for field in FIELDS:
+            value, register = data.get(field), registers.get(field)
+            if register is None:
+                if value is not None:
+                    fields[field] = value
+            elif register[2] != _encode(value):
+                fields[field] = value
+        if not fields:
+            return None
+        return {"c": clock + 1, "t": record.id, "f": fields}
+
+    def log_records(self, records):
+        """Log local edits to `records`; a record without an id gets a fresh one
+
+        Returns True if any record was given a new id.
+        """
+        clock = int(self._meta("clock"))
+        entries = []
+        renamed = False
+        for record in records:
+            registers = self._registers(record.id) if record.id is not None else {}
+            if record.id is None or TOMBSTONE in registers:
+                # New, or brought back (by a restore or import) after being deleted
+                record.id, registers, renamed = new_task_id(), {}, True
+            entry = self._diff(record, registers, clock)
+            if entry is not None:
+                entries.append(entry)
+                clock += 1
+        if entries:
+            self._write(entries, clock)
+        return renamed
+
+    def log_deleted(self, task_ids):
+        """Log the deletion of tasks"""
+        clock = int(self._meta("clock"))
+        entries = []
+        for task_id in task_ids:
+            if task_id is not None:
+                clock += 1
+                entries.append({"c": clock, "t": task_id, "f": {TOMBSTONE: True}})
+        if entries:
+            self._write(entries, clock)
+
+    def reconcile(self, records):
+        """Log every difference between the whole list and the registers
+
+        Used at startup when the task file changed outside the app, and after
+        a restore. Returns True if ids were assigned to records.
+
+        The first reconcile on a device seeds the shared state from its copy
+        of the list at clock 0, so it only fills in fields no device has
+        logged yet and every edit logged elsewhere still wins.
+        """
+        seeded = self._meta("seeded") is not None
+        registers = {}
+        for task, field, clock, device, value in self.db.execute(
+                "SELECT task, field, clock, device, value FROM registers"):
+            registers.setdefault(task, {})[field] = (clock, device, value)
+
+        renamed = False
+        taken = {record.id for record in records if record.id is not None}
+        seen = set()
+        clock = int(self._meta("clock"))
+        entries = []
+        for record in records:
+            if record.id is None or record.id in seen or TOMBSTONE in registers.get(record.id, ()):
+                # Only the first sync migrates old tasks to content-derived ids
+                record.id = new_task_id() if seeded else _legacy_task_id(record, taken)
+                taken.add(record.id)
+                renamed = True
+            seen.add(record.id)
+            entry = self._diff(record, registers.get(record.id, {}), clock)
+            if entry is None:
+                continue
+            if seeded:
+                clock += 1
+            else:
+                # A device joining for the first time may hold a stale copy of
+                # the list: stamped at clock 0, it never beats a real edit
+                entry["c"] = 0
+            entries.append(entry)
+        for task_id, task_registers in registers.items():
+            if task_id not in seen and TOMBSTONE not in task_registers:
+                clock += 1
+                entries.append({"c": clock, "t": task_id, "f": {TOMBSTONE: True}})
+        if entries:
+            self._write(entries, clock)
+        with self.db:
+            self._set_meta("seeded", 1)
+        self.dirty = False
+        return renamed
+
+    def mark_saved(self, tasks_file):
+        """Remember the task file as written with every change logged"""
+        if self.dirty:
+            return
+        stat = os.stat(tasks_file)
+        with self.db:
+            self._set_meta("saved", f"{stat.st_mtime_ns}:{stat.st_size}")
+
+    def needs_reconcile(self, tasks_file):
+        """True if the task file may hold changes that were never logged"""
+        if self.dirty or self._meta("seeded") is None:
+            return True
+        if not os.path.exists(tasks_file):
+            return False
+        stat = os.stat(tasks_file)
+        return self._meta("saved") != f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def pull(self):
+        """Replay what other devices logged since the last pull
+
+        Returns [(task id, TaskRecord, or None if it was deleted)] for every
+        task that changed, in the order the changes were read.
+        """
+        if not os.path.isdir(self.sync_dir):
+            return []
+        device = self.device
+        clock = int(self._meta("clock"))
+        touched = {}
+        with self.db:
+            for name in sorted(os.listdir(self.sync_dir)):
+                other = name[:-len(LOG_SUFFIX)]
+                if not name.endswith(LOG_SUFFIX) or other == device:
+                    continue
+                row = self.db.execute("SELECT position FROM offsets WHERE device = ?",
+                                      (other,)).fetchone()
+                offset = row[0] if row else 0
+                path = os.path.join(self.sync_dir, name)
+                size = os.path.getsize(path)
+                if size == offset:
+                    continue
+                if size < offset:
+                    offset = 0  # the log was replaced; replaying it again is harmless
+                with open(path, 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+                # A trailing partial line is still being written by its device
+                complete = data.rfind(b"\n") + 1
+                for line in data[:complete].splitlines():
+                    try:
+                        entry = json.loads(line)
+                        entry_clock, task_id, fields = entry["c"], entry["t"], entry["f"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    # A line can be valid JSON and still not be a log entry
+                    if (not isinstance(entry_clock, int) or isinstance(entry_clock, bool)
+                            or not isinstance(task_id, str) or not isinstance(fields, dict)):
+                        continue
+                    clock = max(clock, entry_clock)
+                    if self._apply(task_id, entry_clock, other, fields):
+                        touched[task_id] = None
+                self.db.execute("INSERT OR REPLACE INTO offsets VALUES (?, ?)",
+                                (other, offset + complete))
+            self._set_meta("clock", clock)
+        changes = []
+        for task_id in touched:
+            registers = self._registers(task_id)
+            if TOMBSTONE in registers:
+                changes.append((task_id, None))
+            elif "text" in registers:
+                try:
+                    record = self._record(task_id, registers)
+                except (TypeError, ValueError, AttributeError):
+                    continue  # another device logged values no task can hold
+                if record is not None:
+                    changes.append((task_id, record))
+        return changes
+
+    def _apply(self, task_id, entry_clock, other, fields):
+        """Merge one remote entry into a task's registers; True if anything changed"""
+        registers = self._registers(task_id)
+        if TOMBSTONE in registers:
+            return False  # deletion is final whatever its stamp
+        updated = []
+        stamp = (entry_clock, other)
+        for field, value in fields.items():
+            if field != TOMBSTONE and field not in FIELDS:
+                continue
+            current = registers.get(field)
+            if field == TOMBSTONE or current is None or stamp > current[:2]:
+                updated.append((task_id, field, entry_clock, other, _encode(value)))
+        self.db.executemany("INSERT OR REPLACE INTO registers VALUES (?, ?, ?, ?, ?)", updated)
+        return bool(updated)
+
+    def _record(self, task_id, registers):
+        """Build a task from its registers"""
+        data = {field: json.loads(register[2]) for field, register in registers.items()}
+        data = {field: value for field, value in data.items() if value is not None}
+        data["id"] = task_id
+        return TaskRecord.from_data(data)
+
+def main():
+    """Sync a task file with the other devices from the command line"""
+    from todo_io import iter_file, write_file
+
+    parser = argparse.ArgumentParser(description="Sync tasks through a shared folder")
+    parser.add_argument("sync_dir", help="folder shared between devices")
+    parser.add_argument("--tasks-file", default="pixel_todo_tasks.json")
+    parser.add_argument("--state-file", default="pixel_todo_sync.db")
+    args = parser.parse_args()
+
+    sync = SyncLog(args.sync_dir, args.state_file)
+    try:
+        records = list(iter_file(args.tasks_file, "json")) if os.path.exists(args.tasks_file) else []
+        changed = sync.reconcile(records) if sync.needs_reconcile(args.tasks_file) else False
+        updates = dict(sync.pull())
+        if updates:
+            merged = []
+            for record in records:
+                if record.id not in updates:
+                    merged.append(record)
+                    continue
+                update = updates.pop(record.id)
+                if update is not None:
+                    update.has_notes = record.has_notes
+                    merged.append(update)
+            records = merged + [record for record in updates.values() if record is not None]
+            changed = True
+        if changed:
+            write_file(records, args.tasks_file, "json")
+        if os.path.exists(args.tasks_file):
+            sync.mark_saved(args.tasks_file)
+        print(f"⭐ Synced {len(records)} tasks" if changed else "🌙 Already in sync")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        sync.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Tags for the Nighttime To-Do List.
+
+Tags are typed inline (`buy milk #home #errand`). Each tag maps to an int
+used as a bitset over task positions, so multi-tag filters are a handful
+of bitwise operations and per-tag counts are a popcount, however long
+the list is.
+"""
+
+import re
+import sys
+
+TAG_PATTERN = re.compile(r"(?<!\S)#(\w[\w-]*)")
+
+# int.bit_count() arrived in Python 3.10
+popcount = getattr(int, "bit_count", None) or (lambda bits: bin(bits).count("1"))
+
+
+def parse_tags(text):
+    """Split `text` into (text without tags, tuple of lower-cased tags)"""
+    tags = []
+    for tag in TAG_PATTERN.findall(text):
+        tag = sys.intern(tag.lower())
+        if tag not in tags:
+            tags.append(tag)
+    if not tags:
+        return text, ()
+    stripped = " ".join(TAG_PATTERN.sub(" ", text).split())
+    # A task made only of tags keeps its text as typed
+    return (stripped or text), tuple(tags)
+
+
+def format_tags(tags):
+    """Render tags back into inline `#tag` form"""
+    return " ".join(f"#{tag}" for tag in tags)
+
+
+def remove_bit(bits, position):
+    """Delete bit `position`, shifting every higher bit down by one"""
+    low = bits & ((1 << position) - 1)
+    return low | ((bits >> (position + 1)) << position)
+
+
+def next_bit(bits, position):
+    """Lowest set bit at or above `position`, or -1"""
+    rest = bits >> position
+    if not rest:
+        return -1
+    return position + (rest & -rest).bit_length() - 1
+
+
+def previous_bit(bits, position):
+    """Highest set bit below `position`, or -1"""
+    return (bits & ((1 << position) - 1)).bit_length() - 1
+
+
+def nth_bit(bits, n):
+    """Position of the `n`-th set bit (counting from 0), or -1"""
+    if n < 0 or popcount(bits) <= n:
+        return -1
+    # Smallest position whose low bits hold more than n set bits
+    low, high = 0, bits.bit_length()
+    while low < high:
+        middle = (low + high) // 2
+        if popcount(bits & ((1 << (middle + 1)) - 1)) > n:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def iter_bits(bits):
+    """Yield the positions of the set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class TagIndex:
+    """Tag -> bitset of task positions"""
+
+    def __init__(self):
+        self.bits = {}
+
+    def clear(self):
+        """Forget every tag"""
+        self.bits.clear()
+
+    def add(self, position, tags):
+        """Mark the task at `position` with `tags`"""
+        mask = 1 << position
+        for tag in tags:
+            self.bits[tag] = self.bits.get(tag, 0) | mask
+
+    def retag(self, position, old_tags, new_tags):
+        """Move the task at `position` from `old_tags` to `new_tags`"""
+        mask = 1 << position
+        for tag in set(old_tags) - set(new_tags):
+            bits = self.bits.get(tag, 0) & ~mask
+            if bits:
+                self.bits[tag] = bits
+            else:
+                self.bits.pop(tag, None)
+        self.add(position, set(new_tags) - set(old_tags))
+
+    def remove_position(self, position):
+        """Drop the task at `position`; later tasks move up one position"""
+        for tag in list(self.bits):
+            bits = remove_bit(self.bits[tag], position)
+            if bits:
+                self.bits[tag] = bits
+            else:
+                del self.bits[tag]
+
+    def query(self, tags, match_all=True):
+        """Bitset of positions having all (AND) or any (OR) of `tags`"""
+        if not tags:
+            return 0
+        sets = [self.bits.get(tag, 0) for tag in tags]
+        result = sets[0]
+        for bits in sets[1:]:
+            result = result & bits if match_all else result | bits
+        return result
+
+    def count(self, tag):
+        """Number of tasks carrying `tag`"""
+        return popcount(self.bits.get(tag, 0))
+
+    def counts(self):
+        """Return [(tag, count)], most used first"""
+        return sorted(((tag, popcount(bits)) for tag, bits in self.bits.items()),
+                      key=lambda item: (-item[1], item[0]))
@@ -1,55 +1,160 @@
 import sys
-import json
 import os
-from datetime import datetime
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLineEdit, QPushButton, QListWidget, QListWidgetItem, 
-                             QLabel, QCheckBox, QMessageBox, QGraphicsDropShadowEffect)
-from PyQt6.QtCore import Qt, QPoint, pyqtSignal
-from PyQt6.QtGui import QFont, QFontDatabase, QPixmap, QPainter, QPen, QIcon, QColor
+                             QLabel, QCheckBox, QMessageBox, QGraphicsDropShadowEffect,
+                             QDialog, QFileDialog, QMenu, QInputDialog, QCompleter,
+                             QAbstractItemView, QToolTip,
+                             QPlainTextEdit)
+from PyQt6.QtCore import Qt, QEvent, QPoint, QSize, QStringListModel, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import (QFont, QFontDatabase, QPixmap, QPainter, QPen, QIcon, QColor,
+                         QDesktopServices)
+
+from todo_backup import SnapshotStore
+from todo_history import TaskHistory
+from todo_notes import NoteStore
+from todo_io import batched, detect_format, iter_file, tagged_text, write_file
+from todo_records import TaskRecord, new_task_id
+from todo_recurrence import parse_recurrence
+from todo_stats import DailyRollup, format_duration
+from todo_sync import SyncLog
+from todo_tags import (TagIndex, iter_bits, next_bit, nth_bit, parse_tags, popcount,
+                       previous_bit, remove_bit)
+
+FONT_STACK = "-apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif"
 
 class TaskWidget(QWidget):
     """Custom widget for individual tasks with checkbox functionality"""
     task_changed = pyqtSignal()
+    # (completed, completed_at, created_at) - emitted before task_changed
+    completion_toggled = pyqtSignal(bool, object, object)
     
-    def __init__(self, task_text, completed=False, parent=None):
+    # Stylesheets are built once per palette and shared by every task widget
+    _style_cache = {}
+    # Drop-shadow glow behind each card (the rendering benchmark can turn it off)
+    shadow_enabled = True
+    # Tag chips shown on a card before the rest are summarized
+    MAX_CHIPS = 2
+    # Days of upcoming occurrences listed in a recurring task's tooltip
+    UPCOMING_DAYS = 14
+    
+    def __init__(self, record, parent=None):
         super().__init__(parent)
-        self.task_text = task_text
-        self.completed = completed
+        self.record = record
         self.init_ui()
     
+    # The record is the source of truth; the widget only presents it
+    @property
+    def task_text(self):
+        return self.record.text
+    
+    @property
+    def completed(self):
+        return self.record.completed
+    
+    def palette_color(self, name, default):
+        """Fetch a color from the top-level window palette safely"""
+        try:
+            colors = getattr(self.window(), 'colors', None)
+            if isinstance(colors, dict) and name in colors:
+                return colors[name]
+        except Exception:
+            pass
+        return default
+    
+    def styles(self):
+        """Return the shared stylesheet strings for the current palette"""
+        colors = getattr(self.window(), 'colors', None)
+        key = tuple(sorted(colors.items())) if isinstance(colors, dict) else ()
+        styles = TaskWidget._style_cache.get(key)
+        if styles is None:
+            color = self.palette_color
+            styles = {
+                "card": f"""
+                    QWidget {{
+                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                            stop:0 {color('lavender', '#D9B8F2')},
+                            stop:1 {color('pink', '#F7BFD0')});
+                        border: 1px solid rgba(196, 154, 133, 0.5);
+                        border-radius: 12px;
+                    }}
+                """,
+                "checkbox": f"""
+                    QCheckBox {{
+                        background: transparent;
+                        color: {color('taskText', '#F5F3EF')};
+                        font-size: 13px;
+                        spacing: 5px;
+                        font-family: {FONT_STACK};
+                    }}
+                    QCheckBox::indicator {{
+                        width: 18px;
+                        height: 18px;
+                        border: 2px solid {color('brown', '#C49A85')};
+                        background-color: {color('cream', '#FFFDF7')};
+                        border-radius: 9px;
+                    }}
+                    QCheckBox::indicator:checked {{
+                        background-color: {color('lavender', '#D9B8F2')};
+                        border-color: {color('brown', '#C49A85')};
+                        image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAyNCAyNCIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEyIDJMMTQuOTQyIDguODI0N0gyMi4xODZMMTYuMzkyIDEyLjk1MkwxOC45NDIgMjAuMTc1TDEyIDE1Ljc3MUw1LjA1NzcgMjAuMTc1TDcuNjA4NyAxMi45NTJMMC44MTM5NSA4LjgyNDdINy4wNTc4TDEyIDJaIiBmaWxsPSIjRkZGN0ZFIi8+Cjwvc3ZnPgo=);
+                    }}
+                    QCheckBox::indicator:hover {{
+                        border-color: {color('yellow', '#FBE89B')};
+                        background-color: {color('pink', '#F7BFD0')};
+                    }}
+                """,
+                "label_done": f"""
+                    QLabel {{
+                        color: {color('taskTextCompleted', '#8A776E')};
+                        font-size: 13px;
+                        background: transparent;
+                        text-decoration: line-through;
+                        font-family: {FONT_STACK};
+                        font-weight: normal;
+                    }}
+                """,
+                "label": f"""
+                    QLabel {{
+                        color: {color('taskText', '#4A3B34')};
+                        font-size: 13px;
+                        background: transparent;
+                        font-family: {FONT_STACK};
+                        font-weight: normal;
+                    }}
+                """,
+                "chip": f"""
+                    QLabel {{
+                        color: {color('textDark', '#4A3B34')};
+                        background: {color('yellow', '#FBE89B')};
+                        border: 1px solid {color('brown', '#C49A85')};
+                        border-radius: 7px;
+                        padding: 0px 5px;
+                        font-size: 10px;
+                        font-family: {FONT_STACK};
+                    }}
+                """,
+            }
+            TaskWidget._style_cache[key] = styles
+        return styles
+    
     def init_ui(self):
         """Initialize the task widget UI"""
-        # Helper to fetch colors from the top-level window palette safely
-        def palette_color(name, default):
-            try:
-                win = self.window()
-                colors = getattr(win, 'colors', None)
-                if isinstance(colors, dict) and name in colors:
-                    return colors[name]
-            except Exception:
-                pass
-            return default
-
-        self._palette_color = palette_color
+        styles = self.styles()
         
         # Pastel card background for each task
-        self.setStyleSheet(f"""
-            QWidget {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {self._palette_color('lavender', '#D9B8F2')},
-                    stop:1 {self._palette_color('pink', '#F7BFD0')});
-                border: 1px solid rgba(196, 154, 133, 0.5);
-                border-radius: 12px;
-            }}
-        """)
+        self.setStyleSheet(styles["card"])
 
         # Subtle glow effect; intensify on hover via enter/leave events
-        self._glow = QGraphicsDropShadowEffect(self)
-        self._glow.setBlurRadius(10)
-        self._glow.setOffset(0, 2)
-        self._glow.setColor(QColor(self._palette_color('sky', '#B8D8FF')))
-        self.setGraphicsEffect(self._glow)
+        if self.shadow_enabled:
+            self._glow = QGraphicsDropShadowEffect(self)
+            self._glow.setBlurRadius(10)
+            self._glow.setOffset(0, 2)
+            self._glow.setColor(QColor(self.palette_color('sky', '#B8D8FF')))
+            self.setGraphicsEffect(self._glow)
         layout = QHBoxLayout(self)
         layout.setContentsMargins(5, 3, 5, 3)
         layout.setSpacing(8)
@@ -57,31 +162,7 @@ class TaskWidget(QWidget):
         # Checkbox for task completion
         self.checkbox = QCheckBox()
         self.checkbox.setChecked(self.completed)
-        self.checkbox.setStyleSheet(f"""
-            QCheckBox {{
-                background: transparent;
-                color: {self._palette_color('taskText', '#F5F3EF')};
-                font-size: 13px;
-                spacing: 5px;
-                font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-                border: 2px solid {self._palette_color('brown', '#C49A85')};
-                background-color: {self._palette_color('cream', '#FFFDF7')};
-                border-radius: 9px;
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {self._palette_color('lavender', '#D9B8F2')};
-                border-color: {self._palette_color('brown', '#C49A85')};
-                image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAyNCAyNCIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEyIDJMMTQuOTQyIDguODI0N0gyMi4xODZMMTYuMzkyIDEyLjk1MkwxOC45NDIgMjAuMTc1TDEyIDE1Ljc3MUw1LjA1NzcgMjAuMTc1TDcuNjA4NyAxMi45NTJMMC44MTM5NSA4LjgyNDdINy4wNTc4TDEyIDJaIiBmaWxsPSIjRkZGN0ZFIi8+Cjwvc3ZnPgo=);
-            }}
-            QCheckBox::indicator:hover {{
-                border-color: {self._palette_color('yellow', '#FBE89B')};
-                background-color: {self._palette_color('pink', '#F7BFD0')};
-            }}
-        """)
+        self.checkbox.setStyleSheet(styles["checkbox"])
         self.checkbox.stateChanged.connect(self.toggle_completion)
         
         # Task label
@@ -95,6 +176,28 @@ class TaskWidget(QWidget):
         layout.addWidget(self.checkbox)
         layout.addWidget(self.task_label, 1)  # Give label full space
         
+        # Recurring tasks show their next due day; the tooltip expands the rule
+        self.recur_chip = None
+        if self.record.recur is not None:
+            self.recur_chip = QLabel()
+            self.recur_chip.setStyleSheet(styles["chip"])
+            self.recur_chip.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.update_recur_chip()
+            self.recur_chip.installEventFilter(self)
+            layout.addWidget(self.recur_chip, 0, Qt.AlignmentFlag.AlignVCenter)
+        
+        # Tag chips; beyond MAX_CHIPS the remainder is summarized as "+n"
+        tags = self.record.tags
+        chips = ["📝"] if self.record.has_notes else []
+        chips += [f"#{tag}" for tag in tags[:self.MAX_CHIPS]]
+        if len(tags) > self.MAX_CHIPS:
+            chips.append(f"+{len(tags) - self.MAX_CHIPS}")
+        for text in chips:
+            chip = QLabel(text)
+            chip.setStyleSheet(styles["chip"])
+            chip.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(chip, 0, Qt.AlignmentFlag.AlignVCenter)
+        
         self.setLayout(layout)
 
     def enterEvent(self, event):
@@ -107,49 +210,259 @@ class TaskWidget(QWidget):
             self._glow.setBlurRadius(10)
         super().leaveEvent(event)
     
+    def update_recur_chip(self):
+        """Show the next due day on the recurrence chip"""
+        rule = self.record.recur
+        due = "today" if rule.due == date.today() else rule.due.strftime("%b %d")
+        self.recur_chip.setText(f"🔁 {due}")
+    
+    def recur_tooltip(self):
+        """The rule and its occurrences over the next couple of weeks"""
+        rule = self.record.recur
+        upcoming = rule.upcoming(date.today() + timedelta(days=self.UPCOMING_DAYS))
+        lines = [f"Repeats {rule.describe()}"]
+        lines += [day.strftime("%a %b %d") for day in upcoming]
+        return "\n".join(lines)
+    
+    def eventFilter(self, watched, event):
+        # Occurrences are only expanded when the chip's tooltip is asked for
+        if watched is self.recur_chip and event.type() == QEvent.Type.ToolTip:
+            QToolTip.showText(event.globalPos(), self.recur_tooltip(), self.recur_chip)
+            return True
+        return super().eventFilter(watched, event)
+    
+    def complete_occurrence(self):
+        """Check off the due instance of a recurring task and move to the next"""
+        record = self.record
+        now = int(time.time())
+        due_start = int(datetime.combine(record.recur.due, datetime.min.time()).timestamp())
+        self.completion_toggled.emit(True, now, min(due_start, now))
+        record.recur.advance()
+        # The task itself stays open, waiting for its next occurrence
+        self.checkbox.blockSignals(True)
+        self.checkbox.setChecked(False)
+        self.checkbox.blockSignals(False)
+        self.update_recur_chip()
+        self.task_changed.emit()
+    
     def toggle_completion(self, state):
         """Toggle task completion status"""
-        self.completed = state == Qt.CheckState.Checked.value
+        record = self.record
+        if record.recur is not None and state == Qt.CheckState.Checked.value:
+            self.complete_occurrence()
+            return
+        record.completed = state == Qt.CheckState.Checked.value
+        if record.completed:
+            record.completed_at = int(time.time())
+            self.completion_toggled.emit(True, record.completed_at, record.created_at)
+        else:
+            # Report the completion being undone so statistics can retract it
+            previous, record.completed_at = record.completed_at, None
+            if previous is not None:
+                self.completion_toggled.emit(False, previous, record.created_at)
         self.update_label_style()
         self.task_changed.emit()
     
     def update_label_style(self):
         """Update label style based on completion status"""
-        if self.completed:
-            self.task_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {self._palette_color('taskTextCompleted', '#8A776E')};
-                    font-size: 13px;
-                    background: transparent;
-                    text-decoration: line-through;
-                    font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif;
-                    font-weight: normal;
-                }}
-            """)
-        else:
-            self.task_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {self._palette_color('taskText', '#4A3B34')};
-                    font-size: 13px;
-                    background: transparent;
-                    font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif;
-                    font-weight: normal;
-                }}
-            """)
+        styles = self.styles()
+        self.task_label.setStyleSheet(styles["label_done"] if self.completed else styles["label"])
     
     def get_task_data(self):
         """Return task data as dictionary"""
-        return {
-            "text": self.task_text,
-            "completed": self.completed
-        }
+        return self.record.to_data()
+
+class StatsDialog(QDialog):
+    """Panel with completions per day/week, streaks and time-to-complete"""
+    
+    def __init__(self, summary, colors, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📊 Statistics")
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: {colors['cream']};
+            }}
+            QLabel {{
+                color: {colors['textDark']};
+                background: transparent;
+                font-size: 12px;
+                font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif;
+            }}
+        """)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(6)
+        
+        def add_section(title, rows):
+            heading = QLabel(title)
+            heading.setStyleSheet("font-weight: bold; font-size: 13px;")
+            layout.addWidget(heading)
+            peak = max([count for _, count in rows] + [1])
+            for label, count in rows:
+                # Proportional text bar keeps the panel light-weight
+                bar = "▇" * round(8 * count / peak)
+                layout.addWidget(QLabel(f"{label:<10} {bar} {count}"))
+        
+        add_section("🌙 Last 7 days",
+                    [(day.strftime("%a %d"), count) for day, count in summary["per_day"]])
+        add_section("⭐ Last 4 weeks",
+                    [(day.strftime("%b %d"), count) for day, count in summary["per_week"]])
+        
+        layout.addWidget(QLabel(
+            f"🔥 Current streak: {summary['current_streak']} day(s) • "
+            f"best: {summary['longest_streak']}"))
+        layout.addWidget(QLabel(
+            f"⏱ Average time to complete: {format_duration(summary['average_seconds'])}"))
+        layout.addWidget(QLabel(f"✅ {summary['total']} completions recorded"))
+
+class NotesDialog(QDialog):
+    """Detail pane with a task's note and attachments, read from the note store on open"""
+    
+    def __init__(self, record, notes, colors, parent=None):
+        super().__init__(parent)
+        self.record = record
+        self.notes = notes
+        self.setWindowTitle("📝 Notes")
+        self.resize(360, 420)
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: {colors['cream']};
+            }}
+            QLabel, QPlainTextEdit, QListWidget, QPushButton {{
+                color: {colors['textDark']};
+                font-size: 12px;
+                font-family: {FONT_STACK};
+            }}
+            QLabel {{
+                background: transparent;
+            }}
+            QPlainTextEdit, QListWidget {{
+                background: white;
+                border: 1px solid {colors['brown']};
+                border-radius: 6px;
+            }}
+            QPushButton {{
+                background: {colors['lavender']};
+                border: 1px solid {colors['brown']};
+                border-radius: 6px;
+                padding: 4px 8px;
+            }}
+            QPushButton:hover {{
+                background: {colors['yellow']};
+            }}
+        """)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(6)
+        
+        # The full task text, without the card's height cap
+        title = QLabel(f"🐰 {record.text}")
+        title.setWordWrap(True)
+        title.setStyleSheet("font-weight: bold; font-size: 13px;")
+        layout.addWidget(title)
+        
+        self.note_edit = QPlainTextEdit()
+        self.note_edit.setPlaceholderText("Details, links, checklists... 🌙")
+        self.note_edit.setPlainText(notes.read_note(record.id))
+        layout.addWidget(self.note_edit, 1)
+        
+        layout.addWidget(QLabel("📎 Attachments"))
+        self.attachment_list = QListWidget()
+        self.attachment_list.itemDoubleClicked.connect(self.open_attachment)
+        layout.addWidget(self.attachment_list)
+        
+        buttons = QHBoxLayout()
+        for text, slot in (("Attach...", self.add_attachment), ("Open", self.open_attachment),
+                           ("Remove", self.remove_attachment), ("Save", self.accept)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+        self.refresh_attachments()
+    
+    def refresh_attachments(self):
+        """List the task's attachments with their sizes"""
+        self.attachment_list.clear()
+        for name, size in self.notes.attachments(self.record.id):
+            item = QListWidgetItem(f"{name}  ({size / 1024:.1f} KB)")
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.attachment_list.addItem(item)
+    
+    def selected_attachment(self):
+        item = self.attachment_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+    
+    def add_attachment(self):
+        """Copy files into the note store"""
+        paths, _ = QFileDialog.getOpenFileNames(self, "Attach files")
+        try:
+            for path in paths:
+                self.notes.add_attachment(self.record.id, path)
+        except OSError as e:
+            QMessageBox.warning(self, "Attach Failed", f"Could not attach the file:\n{e}")
+        self.refresh_attachments()
+    
+    def open_attachment(self, *_):
+        """Open the selected attachment with the system's default application"""
+        name = self.selected_attachment()
+        if name:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(
+                os.path.abspath(self.notes.attachment_path(self.record.id, name))))
+    
+    def remove_attachment(self):
+        name = self.selected_attachment()
+        if name:
+            self.notes.remove_attachment(self.record.id, name)
+            self.refresh_attachments()
+    
+    def accept(self):
+        """Write the note back to the store"""
+        try:
+            self.notes.write_note(self.record.id, self.note_edit.toPlainText())
+        except OSError as e:
+            QMessageBox.warning(self, "Save Failed", f"Could not save the note:\n{e}")
+            return
+        super().accept()
 
 class PixelTodoApp(QWidget):
-    def __init__(self):
+    # Lists longer than this switch to low-memory mode automatically
+    LOW_MEMORY_THRESHOLD = 500
+    # Extra rows kept materialized above and below the viewport in low-memory mode
+    LOW_MEMORY_OVERSCAN = 5
+    # Automatic snapshots: hourly, and shortly after the last save
+    BACKUP_INTERVAL_MS = 60 * 60 * 1000
+    BACKUP_AFTER_SAVE_MS = 60 * 1000
+    # Longest a close waits for the final snapshot to be written
+    BACKUP_CLOSE_TIMEOUT_S = 5
+    # Autocomplete history is written a few seconds after the last added task
+    HISTORY_SAVE_MS = 5000
+    # Shared-folder sync: local edits are logged as they are made, and the
+    # other devices' edits are picked up every minute
+    SYNC_INTERVAL_MS = 60 * 1000
+    
+    # (snapshot id, error) from a restore running on the backup thread
+    backup_restored = pyqtSignal(object, object)
+    
+    def __init__(self, sync_dir=None):
         super().__init__()
         self.tasks_file = "pixel_todo_tasks.json"
+        # Low-memory mode: task widgets exist only for rows near the viewport
+        self.low_memory = os.environ.get("PIXEL_TODO_LOW_MEMORY") == "1"
+        self._live_rows = range(0)
+        self._row_size = None
+        # Tag -> bitset over rows, and the bitset of rows the tag filter shows
+        self.tag_index = TagIndex()
+        self._shown_bits = None  # None: no filter, every row shown
+        self.filter_match_all = True
+        self.stats = DailyRollup("pixel_todo_stats.json")
+        self.backups = SnapshotStore("pixel_todo_backups")
+        self.history = TaskHistory("pixel_todo_history.json")
+        self.notes = NoteStore("pixel_todo_notes")
+        # Sync through a shared folder only when one is given
+        self.sync = SyncLog(sync_dir, "pixel_todo_sync.db") if sync_dir else None
+        self._items_by_id = {}  # task id -> list item, while syncing
         self.drag_position = QPoint()
         self._allow_close = False
+        # Set while a restore rewrites the task file on the backup thread
+        self._restoring = False
         # Pastel theme palette
         self.colors = {
             "grass": "#B8E2A8",       # soft grass green
@@ -165,7 +478,10 @@ class PixelTodoApp(QWidget):
             "taskTextCompleted": "#E8E3DC"  # softer white for completed
         }
         self.init_ui()
+        self.init_backups()
         self.load_tasks()
+        self.init_history()
+        self.init_sync()
         
     def init_ui(self):
         """Initialize the user interface with nighttime mountain theme"""
@@ -254,6 +570,28 @@ class PixelTodoApp(QWidget):
         """)
         clear_button.clicked.connect(self.clear_completed_tasks)
         
+        # Statistics button
+        stats_button = QPushButton("📊")
+        stats_button.setFixedSize(24, 24)
+        stats_button.setToolTip("Show productivity statistics")
+        stats_button.setStyleSheet(clear_button.styleSheet())
+        stats_button.clicked.connect(self.show_statistics)
+        
+        # Import/export menu button
+        transfer_button = QPushButton("📁")
+        transfer_button.setFixedSize(24, 24)
+        transfer_button.setToolTip("Import or export tasks")
+        transfer_button.setStyleSheet(clear_button.styleSheet() + """
+            QPushButton::menu-indicator { image: none; }
+        """)
+        transfer_menu = QMenu(transfer_button)
+        transfer_menu.addAction("📥 Import tasks...", self.import_tasks)
+        transfer_menu.addAction("📤 Export tasks...", self.export_tasks)
+        transfer_menu.addAction("🕰 Restore backup...", self.restore_backup)
+        if self.sync is not None:
+            transfer_menu.addAction("🔄 Sync now", self.sync_tasks)
+        transfer_button.setMenu(transfer_menu)
+        
         # Close button
         close_button = QPushButton("🌸")
         close_button.setFixedSize(24, 24)
@@ -281,6 +619,8 @@ class PixelTodoApp(QWidget):
         header_layout.addWidget(title_label)
         header_layout.addWidget(date_label)
         header_layout.addStretch()
+        header_layout.addWidget(transfer_button)
+        header_layout.addWidget(stats_button)
         header_layout.addWidget(clear_button)
         header_layout.addWidget(close_button)
         
@@ -308,6 +648,27 @@ class PixelTodoApp(QWidget):
         """)
         self.task_input.returnPressed.connect(self.add_task)
         
+        # Autocomplete from past tasks; the history ranks them, the completer only shows them
+        self.completion_model = QStringListModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setMaxVisibleItems(self.history.limit)
+        self.completer.popup().setStyleSheet(f"""
+            QListView {{
+                background: {self.colors['cream']};
+                border: 2px solid {self.colors['brown']};
+                color: {self.colors['textDark']};
+                font-size: 12px;
+                font-family: {FONT_STACK};
+            }}
+            QListView::item:selected {{
+                background: {self.colors['lavender']};
+            }}
+        """)
+        self.task_input.setCompleter(self.completer)
+        self.task_input.textEdited.connect(self.update_completions)
+        
         # Add button
         add_button = QPushButton("⭐ Add Task ⭐")
         add_button.setStyleSheet(f"""
@@ -332,6 +693,36 @@ class PixelTodoApp(QWidget):
         """)
         add_button.clicked.connect(self.add_task)
         
+        # Tag filter bar
+        filter_layout = QHBoxLayout()
+        filter_layout.setSpacing(6)
+        self.tag_filter = QLineEdit()
+        self.tag_filter.setPlaceholderText("Filter by #tags... 🏷")
+        self.tag_filter.setStyleSheet(f"""
+            QLineEdit {{
+                background: {self.colors['cream']};
+                border: 1px solid {self.colors['brown']};
+                color: {self.colors['textDark']};
+                padding: 4px 8px;
+                font-size: 11px;
+                border-radius: 6px;
+                font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Arial, sans-serif;
+            }}
+            QLineEdit:focus {{
+                border-color: {self.colors['lavender']};
+            }}
+        """)
+        self.tag_filter.textChanged.connect(self.apply_tag_filter)
+        
+        self.filter_mode_button = QPushButton("AND")
+        self.filter_mode_button.setFixedSize(40, 24)
+        self.filter_mode_button.setToolTip("Match all tags (AND) or any tag (OR)")
+        self.filter_mode_button.setStyleSheet(clear_button.styleSheet())
+        self.filter_mode_button.clicked.connect(self.toggle_filter_mode)
+        
+        filter_layout.addWidget(self.tag_filter, 1)
+        filter_layout.addWidget(self.filter_mode_button)
+        
         # Task list widget
         self.task_list = QListWidget()
         self.task_list.setStyleSheet(f"""
@@ -364,6 +755,9 @@ class PixelTodoApp(QWidget):
         
         # Set background image
         self.set_background_image()
+        self.task_list.verticalScrollBar().valueChanged.connect(self.sync_visible_widgets)
+        self.task_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.task_list.customContextMenuRequested.connect(self.show_task_menu)
         
         # Optional: disable double-click delete to avoid accidental closures
         # self.task_list.itemDoubleClicked.connect(self.delete_task)
@@ -383,10 +777,14 @@ class PixelTodoApp(QWidget):
         """)
         self.task_counter.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
+        # Controls that change the list; disabled while a restore runs
+        self.edit_controls = [self.task_input, add_button, clear_button, transfer_button]
+        
         # Add all widgets to layout
         layout.addLayout(header_layout)
         layout.addWidget(self.task_input)
         layout.addWidget(add_button)
+        layout.addLayout(filter_layout)
         layout.addWidget(self.task_list)
         layout.addWidget(self.task_counter)
         
@@ -617,44 +1015,266 @@ class PixelTodoApp(QWidget):
                                   "Please keep tasks under 100 characters.")
                 return
             
-            self.create_task_item(task_text, False)
+            self.history.add(task_text)
+            self.history_save.start()
+            task_text, recur = parse_recurrence(task_text)
+            task_text, tags = parse_tags(task_text)
+            record = TaskRecord(task_text, False, int(time.time()), tags=tags, recur=recur,
+                                id=new_task_id())
+            self.log_changes([record])
+            item = self.create_task_item(record)
             self.task_input.clear()
             self.save_tasks()
-            self.update_task_counter()
+            self.apply_tag_filter()
+            if item is not None:
+                self.task_list.scrollToItem(item)
+                self.sync_visible_widgets()
             self.task_input.setFocus()
         else:
             # Gentle reminder if empty
             self.task_input.setPlaceholderText("Please enter a task first! 🌙")
     
-    def create_task_item(self, task_text, completed=False):
-        """Create a task item with checkbox functionality"""
+    def create_task_item(self, record):
+        """Create a list item for a task record"""
         try:
-            # Create custom task widget
-            task_widget = TaskWidget(task_text, completed, self)
-            task_widget.task_changed.connect(self.on_task_changed)
+            if not self.low_memory and self.task_list.count() >= self.LOW_MEMORY_THRESHOLD:
+                self.enable_low_memory()
             
-            # Create list item
+            # Create list item carrying the record
             item = QListWidgetItem()
-            # Calculate proper size hint for the task widget
-            size_hint = task_widget.sizeHint()
-            # Ensure minimum height for text visibility
-            if size_hint.height() < 30:
-                size_hint.setHeight(30)
-            item.setSizeHint(size_hint)
+            item.setData(Qt.ItemDataRole.UserRole, record)
             
-            # Add to list
-            self.task_list.addItem(item)
-            self.task_list.setItemWidget(item, task_widget)
+            if self.low_memory:
+                # Uniform rows; widgets are attached by sync_visible_widgets()
+                item.setSizeHint(self.row_size_hint())
+                self.task_list.addItem(item)
+            else:
+                self.task_list.addItem(item)
+                task_widget = self.attach_task_widget(item)
+                # Calculate proper size hint for the task widget
+                size_hint = task_widget.sizeHint()
+                # Ensure minimum height for text visibility
+                if size_hint.height() < 30:
+                    size_hint.setHeight(30)
+                item.setSizeHint(size_hint)
+            
+            # New rows start out shown; apply_tag_filter() hides them if needed
+            row = self.task_list.count() - 1
+            self.tag_index.add(row, record.tags)
+            if self._shown_bits is not None:
+                self._shown_bits |= 1 << row
+            if self.sync is not None and record.id is not None:
+                self._items_by_id[record.id] = item
+            return item
             
         except Exception as e:
             print(f"Error creating task item: {e}")
             QMessageBox.warning(self, "Error", "Failed to create task item.")
+            return None
+    
+    def attach_task_widget(self, item):
+        """Create the TaskWidget presenting an item's record"""
+        task_widget = TaskWidget(item.data(Qt.ItemDataRole.UserRole), self)
+        task_widget.completion_toggled.connect(self.on_completion_toggled)
+        task_widget.task_changed.connect(self.on_task_changed)
+        self.task_list.setItemWidget(item, task_widget)
+        return task_widget
+    
+    def enable_low_memory(self):
+        """Switch to low-memory mode, releasing widgets outside the viewport"""
+        self.low_memory = True
+        # Every existing row has a widget; callers sync once they are done adding
+        self._live_rows = range(self.task_list.count())
+        self.release_task_widgets()
+        # Uniform rows let sync_visible_widgets() place the viewport arithmetically
+        size_hint = self.row_size_hint()
+        for row in range(self.task_list.count()):
+            self.task_list.item(row).setSizeHint(size_hint)
+    
+    def release_task_widgets(self):
+        """Drop the live task widgets before a bulk insert in low-memory mode"""
+        # Any index widget makes each QListWidget.addItem() cost O(rows)
+        count = self.task_list.count()
+        for row in self._live_rows:
+            if row < count:
+                self.task_list.removeItemWidget(self.task_list.item(row))
+        self._live_rows = range(0)
+    
+    def row_size_hint(self):
+        """Row size used in low-memory mode, measured once from a sample widget"""
+        if self._row_size is None:
+            sample = TaskWidget(TaskRecord("Sample task"), self)
+            size_hint = sample.sizeHint()
+            self._row_size = QSize(size_hint.width(), max(30, size_hint.height()))
+            sample.deleteLater()
+        return self._row_size
+    
+    def next_shown_row(self, row):
+        """First row at or after `row` the tag filter shows, or -1"""
+        if self._shown_bits is None:
+            return row if row < self.task_list.count() else -1
+        return next_bit(self._shown_bits, row)
+    
+    def previous_shown_row(self, row):
+        """Last row before `row` the tag filter shows, or -1"""
+        if self._shown_bits is None:
+            return row - 1
+        return previous_bit(self._shown_bits, row)
+    
+    def first_visible_row(self, page_rows):
+        """Shown row at the top of the viewport, or -1 if no row is shown"""
+        # Worked out from the scroll position and the uniform row height, so it
+        # needs no layout pass: right after rows are removed or hidden, indexAt()
+        # misses until the list has been laid out again
+        position = self.task_list.verticalScrollBar().value()
+        if self.task_list.verticalScrollMode() == QAbstractItemView.ScrollMode.ScrollPerPixel:
+            position //= self.row_size_hint().height() + self.task_list.spacing()
+        shown = self.task_list.count() if self._shown_bits is None else popcount(self._shown_bits)
+        if shown == 0:
+            return -1
+        # The scroll range may not have shrunk yet; keep the last page covered
+        position = max(0, min(position, shown - page_rows))
+        return position if self._shown_bits is None else nth_bit(self._shown_bits, position)
+    
+    def sync_visible_widgets(self, *args):
+        """Keep task widgets only for rows in (or near) the viewport"""
+        if not self.low_memory:
+            return
+        pitch = self.row_size_hint().height() + self.task_list.spacing()
+        page_rows = -(-self.task_list.viewport().height() // pitch) + 1
+        first = self.first_visible_row(page_rows)
+        
+        # Walk shown rows only, so a sparse tag filter never touches hidden ones
+        live = set()
+        row = first
+        for _ in range(self.LOW_MEMORY_OVERSCAN if first >= 0 else 0):
+            row = self.previous_shown_row(row)
+            if row < 0:
+                break
+            live.add(row)
+        row = first
+        for _ in range(page_rows + self.LOW_MEMORY_OVERSCAN):
+            if row < 0:
+                break
+            live.add(row)
+            row = self.next_shown_row(row + 1)
+        
+        count = self.task_list.count()
+        for row in self._live_rows:
+            if row not in live and row < count:
+                self.task_list.removeItemWidget(self.task_list.item(row))
+        for row in live:
+            item = self.task_list.item(row)
+            if self.task_list.itemWidget(item) is None:
+                self.attach_task_widget(item)
+        self._live_rows = live
+    
+    def remove_task_row(self, row):
+        """Remove a row, keeping the tag bitsets aligned with the list"""
+        record = self.task_list.takeItem(row).data(Qt.ItemDataRole.UserRole)
+        if isinstance(record, TaskRecord):
+            self._items_by_id.pop(record.id, None)
+        self.tag_index.remove_position(row)
+        if self._shown_bits is not None:
+            self._shown_bits = remove_bit(self._shown_bits, row)
+    
+    def clear_tasks(self):
+        """Remove every row"""
+        self.task_list.clear()
+        self._items_by_id.clear()
+        self._live_rows = range(0)
+        self.tag_index.clear()
+        self._shown_bits = None if self._shown_bits is None else 0
+    
+    def filter_tags(self):
+        """Tags typed in the filter bar (the leading # is optional)"""
+        words = (word.lstrip("#").lower() for word in self.tag_filter.text().split())
+        return [word for word in words if word]
+    
+    def apply_tag_filter(self, *args):
+        """Show only rows matching the filter bar, touching just the rows that change"""
+        tags = self.filter_tags()
+        all_rows = (1 << self.task_list.count()) - 1
+        target = self.tag_index.query(tags, self.filter_match_all) if tags else all_rows
+        shown = all_rows if self._shown_bits is None else self._shown_bits
+        for row in iter_bits(shown ^ target):
+            self.task_list.item(row).setHidden(not (target >> row) & 1)
+        self._shown_bits = target if tags else None
+        self.update_task_counter()
+        # setHidden() leaves the relayout pending; sync once the list has settled
+        QTimer.singleShot(0, self.sync_visible_widgets)
+    
+    def toggle_filter_mode(self):
+        """Switch the tag filter between AND and OR"""
+        self.filter_match_all = not self.filter_match_all
+        self.filter_mode_button.setText("AND" if self.filter_match_all else "OR")
+        self.apply_tag_filter()
+    
+    def task_records(self):
+        """Iterate over the task records in list order"""
+        for i in range(self.task_list.count()):
+            record = self.task_list.item(i).data(Qt.ItemDataRole.UserRole)
+            if isinstance(record, TaskRecord):
+                yield record
     
     def on_task_changed(self):
         """Handle task completion change"""
+        widget = self.sender()
+        if isinstance(widget, TaskWidget):
+            self.log_changes([widget.record])
         self.save_tasks()
         self.update_task_counter()
     
+    def on_completion_toggled(self, completed, completed_at, created_at):
+        """Keep the daily statistics rollup in step with a completion toggle"""
+        try:
+            self.stats.record(completed_at, created_at, 1 if completed else -1)
+            self.stats.save()
+        except Exception as e:
+            print(f"Error recording statistics: {e}")
+    
+    def show_statistics(self):
+        """Open the productivity statistics panel"""
+        try:
+            StatsDialog(self.stats.summary(), self.colors, self).exec()
+        except Exception as e:
+            print(f"Error showing statistics: {e}")
+            QMessageBox.warning(self, "Error", "Failed to load statistics.")
+    
+    def show_task_menu(self, pos):
+        """Right-click menu for a task"""
+        item = self.task_list.itemAt(pos)
+        if item is None:
+            return
+        menu = QMenu(self)
+        menu.addAction("📝 Notes && attachments...", lambda: self.open_notes(item))
+        menu.addAction("🗑 Delete task", lambda: self.delete_task(item))
+        menu.exec(self.task_list.viewport().mapToGlobal(pos))
+    
+    def open_notes(self, item):
+        """Open the detail pane for a task, loading its notes only now"""
+        record = item.data(Qt.ItemDataRole.UserRole)
+        if not isinstance(record, TaskRecord):
+            return
+        try:
+            if record.id is None:
+                record.id = new_task_id()
+            NotesDialog(record, self.notes, self.colors, self).exec()
+            has_notes = self.notes.has_content(record.id)
+            if has_notes != record.has_notes:
+                record.has_notes = has_notes
+                self.save_tasks()
+                if self.task_list.itemWidget(item) is not None:
+                    self.attach_task_widget(item)  # show or drop the 📝 chip
+        except Exception as e:
+            print(f"Error opening notes: {e}")
+            QMessageBox.warning(self, "Error", "Failed to open the task's notes.")
+    
+    def discard_notes(self, record):
+        """Remove a deleted task's notes and attachments"""
+        if isinstance(record, TaskRecord) and record.id is not None:
+            self.notes.delete(record.id)
+    
     def delete_task(self, item):
         """Delete a task when double-clicked"""
         try:
@@ -664,10 +1284,13 @@ class PixelTodoApp(QWidget):
                                        QMessageBox.StandardButton.No)
             
             if reply == QMessageBox.StandardButton.Yes:
-                row = self.task_list.row(item)
-                self.task_list.takeItem(row)
+                record = item.data(Qt.ItemDataRole.UserRole)
+                self.discard_notes(record)
+                self.log_changes(deleted=[record.id])
+                self.remove_task_row(self.task_list.row(item))
                 self.save_tasks()
                 self.update_task_counter()
+                self.sync_visible_widgets()
         except Exception as e:
             print(f"Error deleting task: {e}")
             QMessageBox.warning(self, "Error", "Failed to delete task.")
@@ -675,17 +1298,20 @@ class PixelTodoApp(QWidget):
     def clear_completed_tasks(self):
         """Clear all completed tasks"""
         try:
-            completed_count = 0
+            deleted = []
             for i in range(self.task_list.count() - 1, -1, -1):
-                item = self.task_list.item(i)
-                task_widget = self.task_list.itemWidget(item)
-                if isinstance(task_widget, TaskWidget) and task_widget.completed:
-                    self.task_list.takeItem(i)
-                    completed_count += 1
+                record = self.task_list.item(i).data(Qt.ItemDataRole.UserRole)
+                if isinstance(record, TaskRecord) and record.completed:
+                    self.discard_notes(record)
+                    self.remove_task_row(i)
+                    deleted.append(record.id)
+            completed_count = len(deleted)
             
             if completed_count > 0:
+                self.log_changes(deleted=deleted)
                 self.save_tasks()
                 self.update_task_counter()
+                self.sync_visible_widgets()
                 QMessageBox.information(self, "Tasks Cleared", 
                                       f"Cleared {completed_count} completed task(s)! ✨")
             else:
@@ -699,42 +1325,45 @@ class PixelTodoApp(QWidget):
         """Update the task counter display"""
         try:
             total_tasks = self.task_list.count()
-            completed_tasks = 0
-            
-            for i in range(total_tasks):
-                item = self.task_list.item(i)
-                task_widget = self.task_list.itemWidget(item)
-                if isinstance(task_widget, TaskWidget) and task_widget.completed:
-                    completed_tasks += 1
+            completed_tasks = sum(1 for record in self.task_records() if record.completed)
             
             pending_tasks = total_tasks - completed_tasks
             
             if total_tasks == 0:
                 self.task_counter.setText("⭐ 0 tasks total ⭐")
+            elif self._shown_bits is not None:
+                # Filtered: matches plus the count of each filter tag
+                tag_counts = " • ".join(f"#{tag} {self.tag_index.count(tag)}"
+                                        for tag in self.filter_tags())
+                self.task_counter.setText(
+                    f"⭐ {popcount(self._shown_bits)} of {total_tasks} shown • {tag_counts} ⭐"
+                )
             else:
                 self.task_counter.setText(
                     f"⭐ {total_tasks} total • {pending_tasks} pending • {completed_tasks} done ⭐"
                 )
+            self.task_counter.setToolTip(
+                " • ".join(f"#{tag} {count}" for tag, count in self.tag_index.counts()))
         except Exception as e:
             print(f"Error updating counter: {e}")
             self.task_counter.setText("⭐ Task counter error")
     
     def save_tasks(self):
         """Save current tasks to a JSON file"""
+        if self._restoring:
+            # The backup thread is replacing the file; it is reloaded afterwards
+            return
         try:
-            tasks = []
-            for i in range(self.task_list.count()):
-                item = self.task_list.item(i)
-                task_widget = self.task_list.itemWidget(item)
-                
-                if isinstance(task_widget, TaskWidget):
-                    tasks.append(task_widget.get_task_data())
-            
             # Ensure directory exists
             os.makedirs(os.path.dirname(os.path.abspath(self.tasks_file)), exist_ok=True)
             
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks, f, indent=2, ensure_ascii=False)
+            # Streamed to a temporary file and swapped in, so a crash never truncates it
+            write_file(self.task_records(), self.tasks_file, "json")
+            # Restarting the timer coalesces a burst of saves into one snapshot
+            self.backup_after_save.start()
+            if self.sync is not None:
+                # Later startups skip the full reconcile while the file is unchanged
+                self.sync.mark_saved(self.tasks_file)
                 
         except Exception as e:
             print(f"Error saving tasks: {e}")
@@ -748,24 +1377,16 @@ class PixelTodoApp(QWidget):
             return
             
         try:
-            with open(self.tasks_file, 'r', encoding='utf-8') as f:
-                tasks = json.load(f)
+            # Entries are streamed; old format (strings) and new format (objects) both load
+            for record in iter_file(self.tasks_file, "json"):
+                self.create_task_item(record)
             
-            # Handle both old format (strings) and new format (objects)
-            for task in tasks:
-                if isinstance(task, str):
-                    # Old format - just text
-                    self.create_task_item(task, False)
-                elif isinstance(task, dict):
-                    # New format - text and completion status
-                    task_text = task.get("text", "").strip()
-                    if task_text:  # Only add non-empty tasks
-                        self.create_task_item(task_text, task.get("completed", False))
+            self.apply_tag_filter()
             
-            self.update_task_counter()
-            
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"JSON decode error: {e}")
+            self.clear_tasks()
+            self.update_task_counter()
             QMessageBox.warning(self, "Load Error", 
                               "Task file is corrupted. Starting with empty list.")
         except Exception as e:
@@ -773,6 +1394,236 @@ class PixelTodoApp(QWidget):
             QMessageBox.warning(self, "Load Error", 
                               "Failed to load saved tasks.")
     
+    def init_history(self):
+        """Load the autocomplete history, seeding it from the task list the first time"""
+        self.history_save = QTimer(self)
+        self.history_save.setSingleShot(True)
+        self.history_save.setInterval(self.HISTORY_SAVE_MS)
+        self.history_save.timeout.connect(self.save_history)
+        if not self.history.load():
+            # Entered as typed, with any @rule and #tags, the same form add() keeps
+            self.history.seed((tagged_text(record), record.created_at)
+                              for record in self.task_records())
+            self.save_history()
+    
+    def update_completions(self, text):
+        """Offer the best past tasks for what has been typed so far"""
+        self.completion_model.setStringList(self.history.complete(text))
+        if self.completion_model.rowCount():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+    
+    def save_history(self):
+        """Write the autocomplete history"""
+        try:
+            self.history.save()
+        except Exception as e:
+            print(f"Error saving task history: {e}")
+    
+    def init_sync(self):
+        """Start the timer that picks up other devices' edits, and sync once now"""
+        if self.sync is None:
+            return
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(self.SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.sync_tasks)
+        self.sync_timer.start()
+        try:
+            # Only needed the first time, or if the file was edited outside the app
+            if self.sync.needs_reconcile(self.tasks_file):
+                self.reconcile_sync()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error syncing tasks: {e}")
+        self.sync_tasks()
+    
+    def reconcile_sync(self):
+        """Log every difference between the whole list and what was last synced"""
+        if self.sync.reconcile(list(self.task_records())):
+            # Ids were assigned; map them and save them
+            items = (self.task_list.item(row) for row in range(self.task_list.count()))
+            self._items_by_id = {item.data(Qt.ItemDataRole.UserRole).id: item for item in items}
+            self.save_tasks()
+        elif os.path.exists(self.tasks_file):
+            self.sync.mark_saved(self.tasks_file)
+    
+    def log_changes(self, records=(), deleted=()):
+        """Log local edits for the other devices to pick up"""
+        if self.sync is None:
+            return
+        try:
+            if deleted:
+                self.sync.log_deleted(deleted)
+            task_ids = [record.id for record in records]
+            if records and self.sync.log_records(records):
+                # A task deleted on another device was edited here; it stays as a new task
+                for task_id, record in zip(task_ids, records):
+                    if record.id != task_id and task_id in self._items_by_id:
+                        self._items_by_id[record.id] = self._items_by_id.pop(task_id)
+        except (OSError, sqlite3.Error) as e:
+            # The next sync reconciles the whole list instead
+            self.sync.dirty = True
+            print(f"Error logging changes for sync: {e}")
+    
+    def update_task_item(self, item, record):
+        """Show another device's version of a task in place"""
+        previous = item.data(Qt.ItemDataRole.UserRole)
+        record.has_notes = previous.has_notes  # notes stay on this device
+        item.setData(Qt.ItemDataRole.UserRole, record)
+        row = self.task_list.row(item)
+        self.tag_index.retag(row, previous.tags, record.tags)
+        if self.task_list.itemWidget(item) is not None:
+            task_widget = self.attach_task_widget(item)
+            if not self.low_memory:
+                size_hint = task_widget.sizeHint()
+                size_hint.setHeight(max(30, size_hint.height()))
+                item.setSizeHint(size_hint)
+    
+    def sync_tasks(self):
+        """Apply the edits other devices made since the last sync, row by row"""
+        if self._restoring:
+            return  # picked up by the next sync, after the reload
+        try:
+            if self.sync.dirty:
+                self.reconcile_sync()
+            changes = self.sync.pull()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error syncing tasks: {e}")
+            return
+        if not changes:
+            return
+        for task_id, record in changes:
+            item = self._items_by_id.get(task_id)
+            if item is None:
+                if record is not None:
+                    self.create_task_item(record)
+            elif record is None:
+                self.discard_notes(item.data(Qt.ItemDataRole.UserRole))
+                self.remove_task_row(self.task_list.row(item))
+            else:
+                self.update_task_item(item, record)
+        # Re-checks only the rows whose tags or presence changed
+        self.apply_tag_filter()
+        self.save_tasks()
+    
+    def init_backups(self):
+        """Start the timers that take automatic snapshots"""
+        self.backup_timer = QTimer(self)
+        self.backup_timer.setInterval(self.BACKUP_INTERVAL_MS)
+        self.backup_timer.timeout.connect(self.backup_tasks)
+        self.backup_timer.start()
+        
+        self.backup_after_save = QTimer(self)
+        self.backup_after_save.setSingleShot(True)
+        self.backup_after_save.setInterval(self.BACKUP_AFTER_SAVE_MS)
+        self.backup_after_save.timeout.connect(self.backup_tasks)
+        # Emitted on the backup thread, delivered on the UI thread
+        self.backup_restored.connect(self.on_backup_restored)
+    
+    def backup_tasks(self):
+        """Snapshot the task file on a worker thread, off the UI thread"""
+        if os.path.exists(self.tasks_file):
+            self.backups.snapshot_in_background(os.path.abspath(self.tasks_file))
+    
+    def restore_backup(self):
+        """Replace the task list with a chosen snapshot"""
+        try:
+            snapshots = self.backups.snapshots()[::-1]
+            if not snapshots:
+                QMessageBox.information(self, "No Backups", 
+                                      "No backups have been taken yet! 🌙")
+                return
+            choice, ok = QInputDialog.getItem(self, "Restore Backup", 
+                                              "Restore tasks from snapshot:", 
+                                              snapshots, 0, False)
+            if not ok:
+                return
+            
+            # The current list is snapshotted and the chosen one written back off
+            # the UI thread; on_backup_restored() reloads the list afterwards
+            self.save_tasks()
+            self.backup_after_save.stop()
+            self.set_editing_enabled(False)
+            self.backups.restore_in_background(
+                os.path.abspath(self.tasks_file), choice,
+                on_done=lambda snapshot_id: self.backup_restored.emit(snapshot_id, None),
+                on_error=lambda e: self.backup_restored.emit(None, e))
+        except (OSError, ValueError) as e:
+            print(f"Error restoring backup: {e}")
+            self.set_editing_enabled(True)
+            QMessageBox.warning(self, "Restore Error", f"Failed to restore backup: {e}")
+    
+    def set_editing_enabled(self, enabled):
+        """Block edits (and the saves they trigger) while a restore runs"""
+        self._restoring = not enabled
+        for widget in self.edit_controls + [self.task_list]:
+            widget.setEnabled(enabled)
+    
+    def on_backup_restored(self, snapshot_id, error):
+        """Reload the list once a restore has finished on the backup thread"""
+        self.set_editing_enabled(True)
+        if error is not None:
+            QMessageBox.warning(self, "Restore Error", f"Failed to restore backup: {error}")
+            return
+        self.clear_tasks()
+        self.load_tasks()
+        if self.sync is not None:
+            # Tasks deleted since the snapshot come back as new ones
+            try:
+                self.reconcile_sync()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error syncing tasks: {e}")
+        self.sync_visible_widgets()
+        QMessageBox.information(self, "Backup Restored", 
+                              f"Restored tasks from {snapshot_id}! ✨")
+    
+    def import_tasks(self):
+        """Append tasks from a CSV, Markdown checklist or todo.txt file"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Tasks", "",
+            "Task files (*.csv *.md *.markdown *.txt);;All files (*)")
+        if not path:
+            return
+        try:
+            imported = 0
+            if self.low_memory:
+                self.release_task_widgets()
+            # Feed the list in batches, keeping the window responsive in between
+            for batch in batched(iter_file(path)):
+                for record in batch:
+                    # Imported tasks are new tasks, whatever ids the file carried
+                    record.id, record.has_notes = new_task_id(), False
+                self.log_changes(batch)
+                for record in batch:
+                    self.create_task_item(record)
+                imported += len(batch)
+                self.task_counter.setText(f"⭐ Importing... {imported} tasks")
+                QApplication.processEvents()
+            
+            self.save_tasks()
+            self.apply_tag_filter()
+            QMessageBox.information(self, "Tasks Imported", 
+                                  f"Imported {imported} task(s)! ✨")
+        except (OSError, ValueError) as e:
+            print(f"Error importing tasks: {e}")
+            self.update_task_counter()
+            QMessageBox.warning(self, "Import Error", f"Failed to import tasks: {e}")
+    
+    def export_tasks(self):
+        """Write all tasks to a CSV, Markdown checklist or todo.txt file"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Tasks", "tasks.md",
+            "Markdown checklist (*.md);;CSV (*.csv);;todo.txt (*.txt)")
+        if not path:
+            return
+        try:
+            write_file(self.task_records(), path, detect_format(path))
+            QMessageBox.information(self, "Tasks Exported", 
+                                  f"Exported {self.task_list.count()} task(s)! 🌙")
+        except (OSError, ValueError) as e:
+            print(f"Error exporting tasks: {e}")
+            QMessageBox.warning(self, "Export Error", f"Failed to export tasks: {e}")
+    
     # Mouse events for dragging functionality
     def mousePressEvent(self, event):
         """Handle mouse press for dragging"""
@@ -789,6 +1640,11 @@ class PixelTodoApp(QWidget):
             self.move(new_position)
             event.accept()
     
+    def showEvent(self, event):
+        """Materialize the rows that became visible once the window is laid out"""
+        super().showEvent(event)
+        self.sync_visible_widgets()
+    
     def closeEvent(self, event):
         """Save tasks when closing the application"""
         try:
@@ -798,6 +1654,18 @@ class PixelTodoApp(QWidget):
                 self.show()
                 return
             self.save_tasks()
+            if self.sync is not None:
+                # Edits are already logged; pick up the last remote ones and let go
+                self.sync_tasks()
+                self.sync.close()
+            self.backup_after_save.stop()
+            self.history_save.stop()
+            self.save_history()
+            # Snapshot on the backup thread, waiting a bounded time for it to land
+            deadline = time.monotonic() + self.BACKUP_CLOSE_TIMEOUT_S
+            self.backups.wait(self.BACKUP_CLOSE_TIMEOUT_S)
+            self.backups.snapshot_in_background(os.path.abspath(self.tasks_file))
+            self.backups.wait(max(0, deadline - time.monotonic()))
             event.accept()
         except Exception as e:
             print(f"Error during close: {e}")
@@ -812,7 +1680,7 @@ class PixelTodoApp(QWidget):
         """Handle keyboard shortcuts"""
         if event.key() == Qt.Key.Key_Escape:
             self.close()
-        elif event.key() == Qt.Key.Key_Delete:
+        elif event.key() == Qt.Key.Key_Delete and not self._restoring:
             # Delete selected task
             current_item = self.task_list.currentItem()
             if current_item:
@@ -839,7 +1707,8 @@ def main():
             pass
         
         # Create and show the main window
-        window = PixelTodoApp()
+        # Sync through a shared folder when PIXEL_TODO_SYNC_DIR points at one
+        window = PixelTodoApp(os.environ.get("PIXEL_TODO_SYNC_DIR"))
         window.show()
         
         # Run the application